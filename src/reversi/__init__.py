@@ -5,6 +5,8 @@ from .board import (
     Field,
     bit,
     Position,
+    PositionBatch,
+    MutableBoard,
     single_line_string,
     multi_line_string,
     unique_positions,
@@ -21,6 +23,7 @@ from .engine import (
     EdaxLine,
     Cassandra,
     CassandraLine,
+    PrincipalVariationEngine,
 )
 from .game import (
     max_score,
@@ -40,16 +43,30 @@ from .game import (
     scores,
     scored_positions,
 )
+from .evaluation import PatternEvaluator, read_weights, write_weights
 from .in_out import read_file, write_file, png
 from .perft import perft
 from .search import (
     NegaMax,
     AlphaBeta,
     PrincipalVariation,
+    InPlacePrincipalVariation,
+    EndgameSolver,
+    IterativeDeepening,
+    MTDf,
     Result,
     HashTable,
+    SharedHashTable,
+    LazySMP,
+    ParallelPrincipalVariation,
     sorted_by_mobility,
     sorted_by_mobility_and_tt,
+    HistorySorter,
+    sorted_fastest_first,
+    OrderingWeights,
+    stability_cutter,
+    TimeManager,
+    TimedPlayer,
 )
 
 __all__ = [
@@ -59,6 +76,8 @@ __all__ = [
     "Field",
     "bit",
     "Position",
+    "PositionBatch",
+    "MutableBoard",
     "single_line_string",
     "multi_line_string",
     "unique_positions",
@@ -73,6 +92,7 @@ __all__ = [
     "EdaxLine",
     "Cassandra",
     "CassandraLine",
+    "PrincipalVariationEngine",
     "max_score",
     "min_score",
     "undefined_score",
@@ -89,6 +109,9 @@ __all__ = [
     "positions",
     "scores",
     "scored_positions",
+    "PatternEvaluator",
+    "read_weights",
+    "write_weights",
     "read_file",
     "write_file",
     "png",
@@ -96,8 +119,21 @@ __all__ = [
     "NegaMax",
     "AlphaBeta",
     "PrincipalVariation",
+    "InPlacePrincipalVariation",
+    "EndgameSolver",
+    "IterativeDeepening",
+    "MTDf",
     "Result",
     "HashTable",
+    "SharedHashTable",
+    "LazySMP",
+    "ParallelPrincipalVariation",
     "sorted_by_mobility",
     "sorted_by_mobility_and_tt",
+    "HistorySorter",
+    "sorted_fastest_first",
+    "OrderingWeights",
+    "stability_cutter",
+    "TimeManager",
+    "TimedPlayer",
 ]
@@ -1,19 +1,28 @@
 "Bit Manipulation functions for bitboard operations"
-from numpy import uint64, add, subtract
+from os import environ
+from numpy import uint64
 
+# Bitboards are Python ints by default, because numpy scalar arithmetic is much slower
+# for single values. 'REVERSI_BACKEND=numpy' stores them as numpy.uint64 instead.
+BitBoard = uint64 if environ.get("REVERSI_BACKEND", "int") == "numpy" else int
+full_bitboard = 0xFFFFFFFFFFFFFFFF
 
-def get_lsb(b: uint64) -> uint64:
+
+def get_lsb(b: int) -> int:
     "Get Least Significant Bit"
-    return b & add(~b, uint64(1), dtype=uint64)
+    b = int(b)
+    return b & -b
 
 
-def cleared_lsb(b: uint64) -> uint64:
+def cleared_lsb(b: int) -> int:
     "Removed Least Significant Bit"
-    return b & subtract(b, uint64(1), dtype=uint64)
+    b = int(b)
+    return b & (b - 1)
 
 
-def countr_zero(b: uint64) -> int:
+def countr_zero(b: int) -> int:
     "Number of consecutive 0 bits in the value of b, starting from the least significant bit"
+    b = int(b)
     if b == 0:
         return 64
-    return int(get_lsb(b)).bit_length() - 1
+    return (b & -b).bit_length() - 1
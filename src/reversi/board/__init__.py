@@ -3,5 +3,8 @@ from reversi.base import *
 from .children import *
 from .field import *
 from .moves import *
-from .play import flips, play, play_pass
+from .mutable_board import MutableBoard
+from .play import flips, flips_bitboard, play, play_pass
 from .position import *
+from .position_batch import PositionBatch
+from .stability import stable_discs, stable_discs_bitboard
@@ -1,5 +1,5 @@
 from enum import Enum
-from numpy import uint64
+from reversi.base import BitBoard
 
 
 Field = Enum('Field', [
@@ -15,6 +15,6 @@ Field = Enum('Field', [
         ], start=0)
 
 
-def bit(f: Field) -> uint64:
+def bit(f: Field) -> int:
     "Returns a bitboard with the field set."
-    return uint64(1) << uint64(f.value)
+    return BitBoard(1) << f.value
@@ -1,19 +1,18 @@
 "Possible moves and game over condition check."
 from itertools import islice
-from numpy import uint64
-from reversi.base import cleared_lsb, countr_zero
-from .field import Field, bit
+from reversi.base import cleared_lsb, countr_zero, full_bitboard
+from .field import Field
 from .position import Position
 from .play import play_pass
 
 
-class Moves(uint64):
+class Moves(int):
     "Represents a set of moves."
 
     class Iterator:
         "Iterates over the moves."
 
-        def __init__(self, b: uint64):
+        def __init__(self, b: int):
             self.b = b
 
         def __next__(self):
@@ -39,72 +38,74 @@ class Moves(uint64):
         return self.bit_count()
 
     def __contains__(self, field: Field) -> bool:
-        return self & bit(field) != 0
+        return self & (1 << field.value) != 0
 
 
 def possible_moves(pos: Position) -> Moves:
     "Returns all possible moves."
-    pos_p = pos.player
-    pos_o = pos.opponent
-    mask0 = pos_o & uint64(0x7E7E7E7E7E7E7E7E)
-
-    flip1 = mask0 & (pos_p << uint64(1))
-    flip2 = mask0 & (pos_p >> uint64(1))
-    flip3 = pos_o & (pos_p << uint64(8))
-    flip4 = pos_o & (pos_p >> uint64(8))
-    flip5 = mask0 & (pos_p << uint64(7))
-    flip6 = mask0 & (pos_p >> uint64(7))
-    flip7 = mask0 & (pos_p << uint64(9))
-    flip8 = mask0 & (pos_p >> uint64(9))
-
-    flip1 |= mask0 & (flip1 << uint64(1))
-    flip2 |= mask0 & (flip2 >> uint64(1))
-    flip3 |= pos_o & (flip3 << uint64(8))
-    flip4 |= pos_o & (flip4 >> uint64(8))
-    flip5 |= mask0 & (flip5 << uint64(7))
-    flip6 |= mask0 & (flip6 >> uint64(7))
-    flip7 |= mask0 & (flip7 << uint64(9))
-    flip8 |= mask0 & (flip8 >> uint64(9))
-
-    mask1 = mask0 & (mask0 << uint64(1))
-    mask2 = mask1 >> uint64(1)
-    mask3 = pos_o & (pos_o << uint64(8))
-    mask4 = mask3 >> uint64(8)
-    mask5 = mask0 & (mask0 << uint64(7))
-    mask6 = mask5 >> uint64(7)
-    mask7 = mask0 & (mask0 << uint64(9))
-    mask8 = mask7 >> uint64(9)
-
-    flip1 |= mask1 & (flip1 << uint64(2))
-    flip2 |= mask2 & (flip2 >> uint64(2))
-    flip3 |= mask3 & (flip3 << uint64(16))
-    flip4 |= mask4 & (flip4 >> uint64(16))
-    flip5 |= mask5 & (flip5 << uint64(14))
-    flip6 |= mask6 & (flip6 >> uint64(14))
-    flip7 |= mask7 & (flip7 << uint64(18))
-    flip8 |= mask8 & (flip8 >> uint64(18))
-
-    flip1 |= mask1 & (flip1 << uint64(2))
-    flip2 |= mask2 & (flip2 >> uint64(2))
-    flip3 |= mask3 & (flip3 << uint64(16))
-    flip4 |= mask4 & (flip4 >> uint64(16))
-    flip5 |= mask5 & (flip5 << uint64(14))
-    flip6 |= mask6 & (flip6 >> uint64(14))
-    flip7 |= mask7 & (flip7 << uint64(18))
-    flip8 |= mask8 & (flip8 >> uint64(18))
-
-    flip1 <<= uint64(1)
-    flip2 >>= uint64(1)
-    flip3 <<= uint64(8)
-    flip4 >>= uint64(8)
-    flip5 <<= uint64(7)
-    flip6 >>= uint64(7)
-    flip7 <<= uint64(9)
-    flip8 >>= uint64(9)
-
-    return Moves(
-        pos.empties() & (flip1 | flip2 | flip3 | flip4 | flip5 | flip6 | flip7 | flip8)
-    )
+    return Moves(possible_moves_bitboard(pos.player, pos.opponent))
+
+
+def possible_moves_bitboard(pos_p: int, pos_o: int) -> int:
+    "Returns all possible moves as a bitboard. Works on numpy uint64 arrays too."
+    mask0 = pos_o & 0x7E7E7E7E7E7E7E7E
+
+    flip1 = mask0 & (pos_p << 1)
+    flip2 = mask0 & (pos_p >> 1)
+    flip3 = pos_o & (pos_p << 8)
+    flip4 = pos_o & (pos_p >> 8)
+    flip5 = mask0 & (pos_p << 7)
+    flip6 = mask0 & (pos_p >> 7)
+    flip7 = mask0 & (pos_p << 9)
+    flip8 = mask0 & (pos_p >> 9)
+
+    flip1 |= mask0 & (flip1 << 1)
+    flip2 |= mask0 & (flip2 >> 1)
+    flip3 |= pos_o & (flip3 << 8)
+    flip4 |= pos_o & (flip4 >> 8)
+    flip5 |= mask0 & (flip5 << 7)
+    flip6 |= mask0 & (flip6 >> 7)
+    flip7 |= mask0 & (flip7 << 9)
+    flip8 |= mask0 & (flip8 >> 9)
+
+    mask1 = mask0 & (mask0 << 1)
+    mask2 = mask1 >> 1
+    mask3 = pos_o & (pos_o << 8)
+    mask4 = mask3 >> 8
+    mask5 = mask0 & (mask0 << 7)
+    mask6 = mask5 >> 7
+    mask7 = mask0 & (mask0 << 9)
+    mask8 = mask7 >> 9
+
+    flip1 |= mask1 & (flip1 << 2)
+    flip2 |= mask2 & (flip2 >> 2)
+    flip3 |= mask3 & (flip3 << 16)
+    flip4 |= mask4 & (flip4 >> 16)
+    flip5 |= mask5 & (flip5 << 14)
+    flip6 |= mask6 & (flip6 >> 14)
+    flip7 |= mask7 & (flip7 << 18)
+    flip8 |= mask8 & (flip8 >> 18)
+
+    flip1 |= mask1 & (flip1 << 2)
+    flip2 |= mask2 & (flip2 >> 2)
+    flip3 |= mask3 & (flip3 << 16)
+    flip4 |= mask4 & (flip4 >> 16)
+    flip5 |= mask5 & (flip5 << 14)
+    flip6 |= mask6 & (flip6 >> 14)
+    flip7 |= mask7 & (flip7 << 18)
+    flip8 |= mask8 & (flip8 >> 18)
+
+    flip1 <<= 1
+    flip2 >>= 1
+    flip3 <<= 8
+    flip4 >>= 8
+    flip5 <<= 7
+    flip6 >>= 7
+    flip7 <<= 9
+    flip8 >>= 9
+
+    empties = (pos_p | pos_o) ^ full_bitboard
+    return empties & (flip1 | flip2 | flip3 | flip4 | flip5 | flip6 | flip7 | flip8)
 
 
 def mobility(pos: Position) -> int:
@@ -0,0 +1,52 @@
+"Board that is changed in place."
+from .moves import possible_moves_bitboard
+from .play import flips_bitboard
+from .position import Position
+
+
+class MutableBoard:
+    """
+    A board that plays and undoes moves in place, to search without creating a Position per node.
+    Moves are given as bitboards with one bit set.
+    """
+
+    def __init__(self, pos: Position) -> None:
+        self.player = int(pos.player)
+        self.opponent = int(pos.opponent)
+
+    def position(self) -> Position:
+        "Returns the current position."
+        return Position(self.player, self.opponent)
+
+    def possible_moves(self) -> int:
+        "Returns all possible moves as a bitboard."
+        return possible_moves_bitboard(self.player, self.opponent)
+
+    def play(self, x: int) -> int:
+        "Plays a move and returns the flipped fields, which 'undo' needs."
+        flips = flips_bitboard(self.player, self.opponent, x)
+        self.player, self.opponent = self.opponent ^ flips, self.player ^ flips ^ x
+        return flips
+
+    def undo(self, x: int, flips: int) -> None:
+        "Undoes a move, given the flipped fields 'play' returned."
+        self.player, self.opponent = self.opponent ^ flips ^ x, self.player ^ flips
+
+    def play_pass(self) -> None:
+        "Plays a pass, which is its own undo."
+        self.player, self.opponent = self.opponent, self.player
+
+    def empty_count(self) -> int:
+        "Returns the number of empty fields."
+        return 64 - (self.player | self.opponent).bit_count()
+
+    def end_score(self) -> int:
+        "Returns the end score, assuming the game is over."
+        p = self.player.bit_count()
+        o = self.opponent.bit_count()
+        if p > o:
+            return 64 - 2 * o
+        elif p < o:
+            return 2 * p - 64
+        else:
+            return 0
@@ -1,40 +1,52 @@
 "Play a move on a position."
-from numpy import uint64
 from .field import Field, bit
 from .position import Position
 
 
-def flips_in_one_direction(pos: Position, x, y, dx, dy) -> uint64:
-    "Returns the flips in one direction."
-    bits = uint64(0)
-    x += dx
-    y += dy
-    while (x >= 0) and (x < 8) and (y >= 0) and (y < 8):
-        index = uint64(x * 8 + y)
-        mask = uint64(1) << index
-        if pos.opponent & mask:
-            bits |= mask
-        elif pos.player & mask:
-            return bits
-        else:
-            break
-        x += dx
-        y += dy
-    return uint64(0)
-
-
-def flips(pos: Position, move: Field) -> uint64:
+def flips_to_the_left(player: int, mask: int, x: int, shift: int) -> int:
+    "Returns the flips of a move in the direction of a left shift."
+    flip = mask & (x << shift)
+    flip |= mask & (flip << shift)
+    mask &= mask << shift
+    shift2 = shift + shift
+    flip |= mask & (flip << shift2)
+    flip |= mask & (flip << shift2)
+    if player & (flip << shift):
+        return flip
+    return 0
+
+
+def flips_to_the_right(player: int, mask: int, x: int, shift: int) -> int:
+    "Returns the flips of a move in the direction of a right shift."
+    flip = mask & (x >> shift)
+    flip |= mask & (flip >> shift)
+    mask &= mask >> shift
+    shift2 = shift + shift
+    flip |= mask & (flip >> shift2)
+    flip |= mask & (flip >> shift2)
+    if player & (flip >> shift):
+        return flip
+    return 0
+
+
+def flips(pos: Position, move: Field) -> int:
     "Returns the flipped fields for a move as a bitboard."
-    x, y = divmod(move.value, 8)
+    return flips_bitboard(pos.player, pos.opponent, bit(move))
+
+
+def flips_bitboard(pos_p: int, pos_o: int, x: int) -> int:
+    "Returns the flipped fields for a move, given as a bitboard 'x'."
+    # Kogge-Stone like in 'possible_moves', but starting from the move instead of the player.
+    mask0 = pos_o & 0x7E7E7E7E7E7E7E7E
     return (
-        flips_in_one_direction(pos, x, y, -1, -1)
-        | flips_in_one_direction(pos, x, y, -1, +0)
-        | flips_in_one_direction(pos, x, y, -1, +1)
-        | flips_in_one_direction(pos, x, y, +0, -1)
-        | flips_in_one_direction(pos, x, y, +0, +1)
-        | flips_in_one_direction(pos, x, y, +1, -1)
-        | flips_in_one_direction(pos, x, y, +1, +0)
-        | flips_in_one_direction(pos, x, y, +1, +1)
+        flips_to_the_left(pos_p, mask0, x, 1)
+        | flips_to_the_right(pos_p, mask0, x, 1)
+        | flips_to_the_left(pos_p, pos_o, x, 8)
+        | flips_to_the_right(pos_p, pos_o, x, 8)
+        | flips_to_the_left(pos_p, mask0, x, 7)
+        | flips_to_the_right(pos_p, mask0, x, 7)
+        | flips_to_the_left(pos_p, mask0, x, 9)
+        | flips_to_the_right(pos_p, mask0, x, 9)
     )
 
 
@@ -43,10 +55,9 @@ def play(pos: Position, move: Field) -> Position:
     if move == Field.PS:
         return play_pass(pos)
     else:
-        bits = flips(pos, move)
-        return Position(pos.opponent ^ bits, pos.player ^ bits ^ bit(move))
+        return pos.played(flips(pos, move), bit(move))
 
 
 def play_pass(pos: Position) -> Position:
     "Returns the position after a pass."
-    return Position(pos.opponent, pos.player)
+    return pos.passed()
@@ -1,6 +1,6 @@
 "Position on the board."
 from typing import Iterable
-from numpy import uint64
+from reversi.base import BitBoard, full_bitboard
 from .bitboard import (
     flipped_codiagonal as bb_flipped_codiagonal,
     flipped_diagonal as bb_flipped_diagonal,
@@ -10,12 +10,23 @@ from .bitboard import (
 from .field import Field
 
 
+# The hash key of a position is 'player * key_p + opponent * key_o' modulo 2^64.
+# Being linear, it can be updated from the flipped discs instead of being recomputed.
+key_p = 0x9E3779B97F4A7C15
+key_o = 0xC2B2AE3D27D4EB4F
+key_flip = (key_o - key_p) & full_bitboard
+
+
 class Position:
     "Represents a position on the board."
 
     def __init__(self, player=0, opponent=0):
-        self.__p = uint64(player)
-        self.__o = uint64(opponent)
+        p = int(player)
+        o = int(opponent)
+        self.__p = BitBoard(p)
+        self.__o = BitBoard(o)
+        self.__key = (p * key_p + o * key_o) & full_bitboard
+        self.__passed_key = (o * key_p + p * key_o) & full_bitboard
 
     @staticmethod
     def start():
@@ -29,13 +40,13 @@ class Position:
         # 'OO-XXXX-OOOOOXX-OOOOXOXOOXOXOXXXOXOOOXXXOXOXOXXXOOXXXXXXOOOOOOOO X'
         # 'OO-XXXX-OOOOOXX-OOOOXOXOOXOXOXXXOXOOOXXXOXOXOXXXOOXXXXXXOOOOOOOO O'
 
-        p = uint64(0)
-        o = uint64(0)
+        p = 0
+        o = 0
         for i in range(64):
             if string[i] == "X":
-                p |= uint64(1) << uint64(63 - i)
+                p |= 1 << (63 - i)
             if string[i] == "O":
-                o |= uint64(1) << uint64(63 - i)
+                o |= 1 << (63 - i)
 
         if string[65] == "X":
             return Position(p, o)
@@ -54,33 +65,58 @@ class Position:
         )
 
     def __hash__(self):
-        return hash((self.player, self.opponent))
+        return self.__key
 
     @property
-    def player(self) -> uint64:
+    def hash_key(self) -> int:
+        "Returns a 64 bit hash of the position."
+        return self.__key
+
+    @property
+    def player(self) -> int:
         "Returns the bitboard of the player."
         return self.__p
 
     @property
-    def opponent(self) -> uint64:
+    def opponent(self) -> int:
         "Returns the bitboard of the opponent."
         return self.__o
 
+    def played(self, flips: int, move: int) -> "Position":
+        "Returns the position after a move, given the flipped discs and the move as bitboards."
+        flips = int(flips)
+        move = int(move)
+        child = Position.__new__(Position)
+        child.__p = self.__o ^ flips
+        child.__o = self.__p ^ flips ^ move
+        child.__key = (self.__passed_key + flips * key_flip + move * key_o) & full_bitboard
+        child.__passed_key = (self.__key - flips * key_flip + move * key_p) & full_bitboard
+        return child
+
+    def passed(self) -> "Position":
+        "Returns the position after a pass."
+        child = Position.__new__(Position)
+        child.__p = self.__o
+        child.__o = self.__p
+        child.__key = self.__passed_key
+        child.__passed_key = self.__key
+        return child
+
     def player_at(self, field: Field) -> bool:
         "Returns whether the player has a disc at the given field."
-        return self.player & (uint64(1) << uint64(field.value)) != uint64(0)
+        return self.player & (1 << field.value) != 0
 
     def opponent_at(self, field: Field) -> bool:
         "Returns whether the opponent has a disc at the given field."
-        return self.opponent & (uint64(1) << uint64(field.value)) != uint64(0)
+        return self.opponent & (1 << field.value) != 0
 
-    def discs(self) -> uint64:
+    def discs(self) -> int:
         "Returns the bitboard of all discs."
         return self.player | self.opponent
 
-    def empties(self) -> uint64:
+    def empties(self) -> int:
         "Returns the bitboard of all empty fields."
-        return ~self.discs()
+        return self.discs() ^ full_bitboard
 
     def empty_count(self) -> int:
         "Returns the number of empty fields."
@@ -0,0 +1,198 @@
+"Batch of positions, evaluated with numpy array operations."
+from typing import Iterable
+import numpy as np
+from reversi.base import full_bitboard
+from .bitboard import flipped_diagonal
+from .field import Field
+from .moves import possible_moves_bitboard
+from .position import Position
+
+position_dtype = np.dtype([("player", np.uint64), ("opponent", np.uint64)])
+
+
+def flips_to_the_left(
+    player: np.ndarray, mask: np.ndarray, x: np.ndarray, shift: int
+) -> np.ndarray:
+    "Returns the flips of moves in the direction of a left shift."
+    flip = mask & (x << shift)
+    flip |= mask & (flip << shift)
+    mask = mask & (mask << shift)
+    flip |= mask & (flip << (2 * shift))
+    flip |= mask & (flip << (2 * shift))
+    return np.where(player & (flip << shift), flip, 0)
+
+
+def flips_to_the_right(
+    player: np.ndarray, mask: np.ndarray, x: np.ndarray, shift: int
+) -> np.ndarray:
+    "Returns the flips of moves in the direction of a right shift."
+    flip = mask & (x >> shift)
+    flip |= mask & (flip >> shift)
+    mask = mask & (mask >> shift)
+    flip |= mask & (flip >> (2 * shift))
+    flip |= mask & (flip >> (2 * shift))
+    return np.where(player & (flip >> shift), flip, 0)
+
+
+def flips(player: np.ndarray, opponent: np.ndarray, x: np.ndarray) -> np.ndarray:
+    "Returns the flipped fields of one move per row. 'x' holds the moves as bitboards."
+    mask0 = opponent & 0x7E7E7E7E7E7E7E7E
+    return (
+        flips_to_the_left(player, mask0, x, 1)
+        | flips_to_the_right(player, mask0, x, 1)
+        | flips_to_the_left(player, opponent, x, 8)
+        | flips_to_the_right(player, opponent, x, 8)
+        | flips_to_the_left(player, mask0, x, 7)
+        | flips_to_the_right(player, mask0, x, 7)
+        | flips_to_the_left(player, mask0, x, 9)
+        | flips_to_the_right(player, mask0, x, 9)
+    )
+
+
+# Reverses the bits of a byte, which flips a row horizontally.
+reversed_bits = np.array([int(f"{i:08b}"[::-1], 2) for i in range(256)], dtype=np.uint8)
+
+
+def symmetric_variants(b: np.ndarray, chunk: slice) -> list[np.ndarray]:
+    "Returns the 8 symmetric variants of a chunk of bitboards."
+    # Vertical and horizontal flips are cheap as byte swap and byte lookup,
+    # so the remaining variants are composed from one diagonal flip.
+    b = np.ascontiguousarray(b[chunk])
+    variants = []
+    for x in (b, flipped_diagonal(b)):
+        h = reversed_bits[x.view(np.uint8)].view(np.uint64)
+        variants += [x, h, x.byteswap(), h.byteswap()]
+    return variants
+
+
+def mixed(p: np.ndarray, o: np.ndarray) -> np.ndarray:
+    "Returns a 64 bit hash of the positions."
+    h = p * 0x9E3779B97F4A7C15 ^ o * 0xC2B2AE3D27D4EB4F
+    return h ^ (h >> 29)
+
+
+class PositionBatch:
+    "Represents many positions as two arrays of bitboards."
+
+    def __init__(self, player, opponent):
+        self.__p = np.asarray(player, dtype=np.uint64)
+        self.__o = np.asarray(opponent, dtype=np.uint64)
+
+    @staticmethod
+    def from_positions(positions: Iterable[Position]) -> "PositionBatch":
+        "Returns a batch of the given positions."
+        positions = list(positions)
+        player = np.fromiter((p.player for p in positions), np.uint64, len(positions))
+        opponent = np.fromiter((p.opponent for p in positions), np.uint64, len(positions))
+        return PositionBatch(player, opponent)
+
+    def __len__(self) -> int:
+        return len(self.__p)
+
+    def __getitem__(self, index):
+        "Returns a Position for an integer index, and a PositionBatch otherwise."
+        if isinstance(index, (int, np.integer)):
+            return Position(int(self.__p[index]), int(self.__o[index]))
+        return PositionBatch(self.__p[index], self.__o[index])
+
+    def __iter__(self):
+        for p, o in zip(self.__p.tolist(), self.__o.tolist()):
+            yield Position(p, o)
+
+    def __eq__(self, o) -> bool:
+        return np.array_equal(self.player, o.player) and np.array_equal(
+            self.opponent, o.opponent
+        )
+
+    @property
+    def player(self) -> np.ndarray:
+        "Returns the bitboards of the players."
+        return self.__p
+
+    @property
+    def opponent(self) -> np.ndarray:
+        "Returns the bitboards of the opponents."
+        return self.__o
+
+    def discs(self) -> np.ndarray:
+        "Returns the bitboards of all discs."
+        return self.__p | self.__o
+
+    def empties(self) -> np.ndarray:
+        "Returns the bitboards of all empty fields."
+        return self.discs() ^ full_bitboard
+
+    def empty_count(self) -> np.ndarray:
+        "Returns the number of empty fields per position."
+        return np.bitwise_count(self.empties()).astype(np.int64)
+
+    def possible_moves(self) -> np.ndarray:
+        "Returns the possible moves per position as bitboards."
+        return possible_moves_bitboard(self.__p, self.__o)
+
+    def play(self, moves) -> "PositionBatch":
+        "Returns the positions after one move per position. Field.PS plays a pass."
+        if not isinstance(moves, np.ndarray):
+            moves = np.fromiter((m.value for m in moves), np.int64, len(self))
+        x = np.uint64(1) << (moves % 64).astype(np.uint64)
+        x[moves == Field.PS.value] = 0
+        bits = flips(self.__p, self.__o, x)
+        return PositionBatch(self.__o ^ bits, self.__p ^ bits ^ x)
+
+    def play_pass(self) -> "PositionBatch":
+        "Returns the positions after a pass."
+        return PositionBatch(self.__o, self.__p)
+
+    def is_game_over(self) -> np.ndarray:
+        "Returns per position whether the game is over."
+        return (self.possible_moves() == 0) & (possible_moves_bitboard(self.__o, self.__p) == 0)
+
+    def end_score(self) -> np.ndarray:
+        "Returns the end score per position, assuming the positions are terminal."
+        p = np.bitwise_count(self.__p).astype(np.int64)
+        o = np.bitwise_count(self.__o).astype(np.int64)
+        diff = p - o
+        empties = 64 - p - o
+        return np.where(diff > 0, diff + empties, np.where(diff < 0, diff - empties, 0))
+
+    def flipped_to_unique(self, chunk_size: int = 1 << 16) -> "PositionBatch":
+        "Returns the unique position from the set of symmetric variants per position."
+        player = np.empty_like(self.__p)
+        opponent = np.empty_like(self.__o)
+        for start in range(0, len(self), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            p_variants = symmetric_variants(self.__p, chunk)
+            o_variants = symmetric_variants(self.__o, chunk)
+            p_min = p_variants[0]
+            o_min = o_variants[0]
+            for p, o in zip(p_variants[1:], o_variants[1:]):
+                smaller = (p < p_min) | ((p == p_min) & (o < o_min))
+                p_min = np.where(smaller, p, p_min)
+                o_min = np.where(smaller, o, o_min)
+            player[chunk] = p_min
+            opponent[chunk] = o_min
+        return PositionBatch(player, opponent)
+
+    def unique_positions(self) -> "PositionBatch":
+        "Returns the unique positions, after flipping each to its unique variant."
+        unique = self.flipped_to_unique()
+        p = unique.player
+        o = unique.opponent
+        if len(unique) == 0:
+            return unique
+
+        # Sorting a 64 bit hash is much faster than sorting (player, opponent) pairs,
+        # and it puts equal positions next to each other unless the hash collides.
+        h = mixed(p, o)
+        order = np.argsort(h)
+        h, p, o = h[order], p[order], o[order]
+        same_hash = h[1:] == h[:-1]
+        same_position = same_hash & (p[1:] == p[:-1]) & (o[1:] == o[:-1])
+        if np.any(same_hash != same_position):
+            pairs = np.empty(len(p), dtype=position_dtype)
+            pairs["player"] = p
+            pairs["opponent"] = o
+            pairs = np.unique(pairs)
+            return PositionBatch(pairs["player"], pairs["opponent"])
+        keep = np.concatenate(([True], ~same_position))
+        return PositionBatch(p[keep], o[keep])
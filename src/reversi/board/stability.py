@@ -0,0 +1,58 @@
+"Stable discs, which can't be flipped for the rest of the game."
+from reversi.base import full_bitboard
+from .position import Position
+
+
+def line_masks(start: int, shift: int, length: int) -> int:
+    return sum(1 << (start + i * shift) for i in range(length))
+
+
+rows = [line_masks(8 * r, 1, 8) for r in range(8)]
+columns = [line_masks(c, 8, 8) for c in range(8)]
+diagonals = [line_masks(c, 9, 8 - c) for c in range(8)] + [
+    line_masks(8 * r, 9, 8 - r) for r in range(1, 8)
+]
+codiagonals = [line_masks(c, 7, c + 1) for c in range(8)] + [
+    line_masks(8 * r + 7, 7, 8 - r) for r in range(1, 8)
+]
+
+# Fields without a neighbour on one side of a direction. Discs there can't be flipped in it.
+horizontal_walls = 0x8181818181818181
+vertical_walls = 0xFF000000000000FF
+diagonal_walls = 0xFF818181818181FF
+
+
+def full_lines(discs: int, lines: list[int]) -> int:
+    "Returns the fields of all lines which are full of discs."
+    full = 0
+    for line in lines:
+        if discs & line == line:
+            full |= line
+    return full
+
+
+def stable_discs_bitboard(player: int, opponent: int) -> int:
+    "Returns a subset of the player's stable discs."
+    discs = player | opponent
+    full_h = full_lines(discs, rows) | horizontal_walls
+    full_v = full_lines(discs, columns) | vertical_walls
+    full_d = full_lines(discs, diagonals) | diagonal_walls
+    full_c = full_lines(discs, codiagonals) | diagonal_walls
+
+    # A disc is stable if in every direction its line is full,
+    # or it has a wall or a stable disc of its own colour as a neighbour.
+    stable = 0
+    while True:
+        h = full_h | ((stable << 1) & 0xFEFEFEFEFEFEFEFE) | ((stable >> 1) & 0x7F7F7F7F7F7F7F7F)
+        v = full_v | (stable << 8) | (stable >> 8)
+        d = full_d | ((stable << 9) & 0xFEFEFEFEFEFEFEFE) | ((stable >> 9) & 0x7F7F7F7F7F7F7F7F)
+        c = full_c | ((stable << 7) & 0x7F7F7F7F7F7F7F7F) | ((stable >> 7) & 0xFEFEFEFEFEFEFEFE)
+        new_stable = player & h & v & d & c & full_bitboard
+        if new_stable == stable:
+            return stable
+        stable = new_stable
+
+
+def stable_discs(pos: Position) -> int:
+    "Returns a subset of the player's stable discs."
+    return stable_discs_bitboard(int(pos.player), int(pos.opponent))
@@ -2,3 +2,4 @@
 from .cassandra import Cassandra, CassandraLine
 from .edax import Edax, EdaxLine
 from .engine import Engine
+from .principal_variation_engine import PrincipalVariationEngine
@@ -0,0 +1,123 @@
+"An engine that searches in Python, without an external binary."
+
+from multiprocessing import Pool, cpu_count
+from typing import Iterable
+from reversi.search import (
+    OpenInterval,
+    Field,
+    Position,
+    Player,
+    Intensity,
+    Result,
+    HashTable,
+    PrincipalVariation,
+    possible_moves,
+    IterativeDeepening,
+    sorted_fastest_first,
+)
+from .engine import Engine
+
+
+def new_search(move_sorter, evaluator, hash_table_size: int) -> IterativeDeepening:
+    """
+    Returns an iterative deepening search of a PrincipalVariation with its own hash table.
+    It has no MultiProbCut, so it has no selective iterations, which would only repeat the solve.
+    """
+    tt = HashTable(hash_table_size)
+    return IterativeDeepening(PrincipalVariation(move_sorter(tt), tt, evaluator=evaluator))
+
+
+# The search of a worker process, which keeps its hash table between tasks.
+worker_search: IterativeDeepening | None = None
+
+
+def init_worker(move_sorter, evaluator, hash_table_size: int) -> None:
+    "Creates the search of a worker process."
+    global worker_search
+    worker_search = new_search(move_sorter, evaluator, hash_table_size)
+
+
+def solve_in_worker(args: tuple[Position, OpenInterval | None, Intensity | None]) -> Result:
+    "Solves a position with the search of the worker process."
+    pos, window, intensity = args
+    worker_search.search.tt.new_generation()
+    return worker_search.eval(pos, window, intensity)
+
+
+class PrincipalVariationEngine(Engine, Player):
+    """
+    Engine around a PrincipalVariation with a hash table, run by IterativeDeepening.
+    It runs in this process, or in a pool of worker processes with a hash table each.
+    """
+
+    def __init__(
+        self,
+        window: OpenInterval | None = None,
+        intensity: Intensity | None = None,
+        hash_table_size: int = 1 << 18,
+        move_sorter=sorted_fastest_first,
+        evaluator=None,
+        workers: int | None = None,
+        chunk_size: int = 16,
+    ):
+        """
+        window: Window of every search. Defaults to the full window.
+        intensity: Intensity of every search. Defaults to solving to the end of the game.
+        hash_table_size: Number of buckets of each hash table.
+        move_sorter: Takes a hash table and returns a move sorter, e.g. sorted_fastest_first.
+        evaluator: Evaluates positions where a depth limited search ends.
+        workers: Number of worker processes of 'solve_many', defaults to the number of CPUs.
+                 With 1, it solves in this process.
+        chunk_size: Number of positions a worker solves per task.
+        """
+        self.window = window
+        self.intensity = intensity
+        self.hash_table_size = hash_table_size
+        self.move_sorter = move_sorter
+        self.evaluator = evaluator
+        self.workers = workers or cpu_count()
+        self.chunk_size = chunk_size
+        self.search = new_search(move_sorter, evaluator, hash_table_size)
+        self.pool = None
+
+    def name(self) -> str:
+        return "PrincipalVariation"
+
+    @property
+    def nodes(self) -> int:
+        "Returns the number of nodes searched in this process."
+        return self.search.nodes
+
+    def solve(self, pos: Position) -> Result:
+        self.search.search.tt.new_generation()
+        return self.search.eval(pos, self.window, self.intensity)
+
+    def solve_many(self, pos: Iterable[Position]) -> list[Result]:
+        if self.workers == 1:
+            return [self.solve(p) for p in pos]
+        if self.pool is None:
+            self.pool = Pool(
+                self.workers,
+                init_worker,
+                (self.move_sorter, self.evaluator, self.hash_table_size),
+            )
+        tasks = [(p, self.window, self.intensity) for p in pos]
+        return self.pool.map(solve_in_worker, tasks, self.chunk_size)
+
+    def choose_move(self, pos: Position) -> Field:
+        if not possible_moves(pos):
+            return Field.PS
+        return self.solve(pos).best_move
+
+    def choose_moves(self, pos: Iterable[Position]) -> list[Field]:
+        pos = list(pos)
+        # Positions without a move are passed, the search's best move would be the opponent's.
+        results = iter(self.solve_many(p for p in pos if possible_moves(p)))
+        return [next(results).best_move if possible_moves(p) else Field.PS for p in pos]
+
+    def close(self) -> None:
+        "Terminates the worker processes."
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
@@ -0,0 +1,5 @@
+"Pattern based evaluation of positions."
+from reversi.game import *
+from .pattern import *
+from .pattern_evaluator import *
+from .training import *
@@ -0,0 +1,92 @@
+"Patterns of fields, whose configurations index a table of weights."
+import numpy as np
+from reversi.board.bitboard import flipped_diagonal, flipped_horizontal, flipped_vertical
+
+# Each pattern extracts the bits of its fields into the lowest bits of an int.
+# The functions work on ints and on numpy arrays of bitboards alike.
+
+
+def edge(b):
+    "A1 to H1."
+    return b & 0xFF
+
+
+def corner_3x3(b):
+    "A1 to C3."
+    return (b & 0x7) | ((b >> 5) & 0x38) | ((b >> 10) & 0x1C0)
+
+
+def corner_2x5(b):
+    "A1 to E2."
+    return (b & 0x1F) | ((b >> 3) & 0x3E0)
+
+
+def diagonal(mask: int, length: int):
+    "Returns a pattern of a diagonal ending in the H column."
+    # Multiplying gathers bits of distinct columns into the top byte, without carries.
+    shift = 64 - length
+
+    def pattern(b):
+        return (((b & mask) * 0x0101010101010101) >> shift) & ((1 << length) - 1)
+
+    pattern.__doc__ = f"Diagonal of length {length}."
+    return pattern
+
+
+patterns = [
+    (edge, 8),
+    (corner_3x3, 9),
+    (corner_2x5, 10),
+    (diagonal(0x8040201008040201, 8), 8),
+    (diagonal(0x0080402010080402, 7), 7),
+    (diagonal(0x0000804020100804, 6), 6),
+    (diagonal(0x0000008040201008, 5), 5),
+]
+
+# Start of each pattern's weights, then one weight for the bias.
+offsets = []
+weight_count = 0
+for _, size in patterns:
+    offsets.append(weight_count)
+    weight_count += 3**size
+bias_index = weight_count
+weight_count += 1
+
+# Maps the bits of a pattern to the base 3 number with the same digits.
+ternary = [sum(3**i for i in range(10) if x >> i & 1) for x in range(1 << 10)]
+ternary_array = np.array(ternary, dtype=np.int64)
+
+
+def symmetric_variants(b) -> list:
+    "Returns the 8 symmetric variants of a bitboard."
+    d = flipped_diagonal(b)
+    variants = []
+    for x in (b, d):
+        v = flipped_vertical(x)
+        variants += [x, flipped_horizontal(x), v, flipped_horizontal(v)]
+    return variants
+
+
+def pattern_indices(player: int, opponent: int) -> list[int]:
+    "Returns the weight index of each pattern in each symmetric variant of a position."
+    indices = []
+    player, opponent = int(player), int(opponent)
+    for p, o in zip(symmetric_variants(player), symmetric_variants(opponent)):
+        for (pattern, _), offset in zip(patterns, offsets):
+            indices.append(offset + ternary[pattern(p)] + 2 * ternary[pattern(o)])
+    indices.append(bias_index)
+    return indices
+
+
+def batch_pattern_indices(player: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+    "Returns the weight indices of many positions, with one row per position."
+    indices = np.empty((len(player), 8 * len(patterns) + 1), dtype=np.int64)
+    column = 0
+    for p, o in zip(symmetric_variants(player), symmetric_variants(opponent)):
+        for (pattern, _), offset in zip(patterns, offsets):
+            indices[:, column] = (
+                offset + ternary_array[pattern(p)] + 2 * ternary_array[pattern(o)]
+            )
+            column += 1
+    indices[:, column] = bias_index
+    return indices
@@ -0,0 +1,70 @@
+"Linear pattern evaluation, read from a compact binary weights file."
+from pathlib import Path
+import numpy as np
+from reversi.game import Position, PositionBatch, min_score, max_score
+from .pattern import weight_count, pattern_indices, batch_pattern_indices
+
+# File layout: magic, stage count and weight count as little endian uint32,
+# followed by the weights of each stage as little endian float16.
+magic = b"RVPW"
+header_dtype = np.dtype([("magic", "S4"), ("stage_count", "<u4"), ("weight_count", "<u4")])
+
+
+def write_weights(file_path: Path | str, weights: np.ndarray) -> None:
+    "Writes weights of shape (stage_count, weight_count) to a file."
+    header = np.array([(magic, weights.shape[0], weights.shape[1])], dtype=header_dtype)
+    with open(file_path, "wb") as file:
+        file.write(header.tobytes())
+        file.write(weights.astype("<f2").tobytes())
+
+
+def read_weights(file_path: Path | str) -> np.ndarray:
+    "Reads weights of shape (stage_count, weight_count) from a file."
+    data = Path(file_path).read_bytes()
+    header = np.frombuffer(data, header_dtype, count=1)[0]
+    if header["magic"] != magic:
+        raise ValueError(f"{file_path} is not a weights file")
+    shape = (int(header["stage_count"]), int(header["weight_count"]))
+    weights = np.frombuffer(data, "<f2", offset=header_dtype.itemsize)
+    return weights.reshape(shape).astype(np.float32)
+
+
+def stage(empty_count, stage_count: int):
+    """
+    Returns the stage of an empty count. Works on ints and numpy arrays.
+    The stages are spread evenly over the empty counts 0 to 60, more empties are in the last stage.
+    """
+    return np.minimum(empty_count * stage_count // 61, stage_count - 1)
+
+
+class PatternEvaluator:
+    "Evaluates positions with linear pattern weights, one set per stage of the game."
+
+    def __init__(self, weights: np.ndarray) -> None:
+        "weights: Array of shape (stage_count, weight_count)."
+        if weights.ndim != 2 or weights.shape[1] != weight_count:
+            raise ValueError(f"Expected weights of shape (stage_count, {weight_count})")
+        self.weights = weights
+
+    @staticmethod
+    def from_file(file_path: Path | str) -> "PatternEvaluator":
+        "Returns an evaluator with the weights of a file."
+        return PatternEvaluator(read_weights(file_path))
+
+    @property
+    def stage_count(self) -> int:
+        "Returns the number of stages."
+        return len(self.weights)
+
+    def eval(self, pos: Position) -> int:
+        "Returns the estimated score of a position."
+        weights = self.weights[stage(pos.empty_count(), self.stage_count)]
+        score = weights[pattern_indices(pos.player, pos.opponent)].sum()
+        return min(max(round(float(score)), min_score), max_score)
+
+    def eval_batch(self, batch: PositionBatch) -> np.ndarray:
+        "Returns the estimated scores of many positions."
+        indices = batch_pattern_indices(batch.player, batch.opponent)
+        stages = stage(batch.empty_count(), self.stage_count)
+        scores = self.weights[stages[:, None], indices].sum(axis=1)
+        return np.clip(np.rint(scores), min_score, max_score).astype(np.int64)
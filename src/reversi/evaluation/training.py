@@ -0,0 +1,137 @@
+"Training of pattern weights from scored games."
+import tempfile
+from pathlib import Path
+from typing import Iterable
+import numpy as np
+from reversi.game import (
+    PositionBatch,
+    ScoredGame,
+    scored_positions,
+    undefined_score,
+)
+from .pattern import weight_count, batch_pattern_indices
+from .pattern_evaluator import stage, write_weights
+
+
+def scored_games_of(file_paths: Iterable[Path | str]) -> Iterable[ScoredGame]:
+    "Yields the scored games of files, one line at a time."
+    for file_path in file_paths:
+        with open(file_path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield ScoredGame.from_string(line.strip())
+
+
+def scored_position_batches(
+    scored_games: Iterable[ScoredGame], batch_size: int = 1 << 16
+) -> Iterable[tuple[PositionBatch, np.ndarray]]:
+    "Yields batches of the positions with a defined score, and their scores."
+    player, opponent, scores = [], [], []
+    for scored_pos in scored_positions(scored_games):
+        if scored_pos.score == undefined_score:
+            continue
+        player.append(int(scored_pos.pos.player))
+        opponent.append(int(scored_pos.pos.opponent))
+        scores.append(scored_pos.score)
+        if len(scores) == batch_size:
+            yield PositionBatch(player, opponent), np.array(scores, dtype=np.float64)
+            player, opponent, scores = [], [], []
+    if scores:
+        yield PositionBatch(player, opponent), np.array(scores, dtype=np.float64)
+
+
+class StageData:
+    "Pattern indices and scores of one stage, stored in chunks on disk."
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.chunk_count = 0
+        self.scores: list[np.ndarray] = []
+
+    def append(self, indices: np.ndarray, scores: np.ndarray) -> None:
+        "Stores a chunk of pattern indices and their scores."
+        np.save(self.directory / f"{self.chunk_count}.npy", indices.astype(np.int32))
+        self.scores.append(scores)
+        self.chunk_count += 1
+
+    def chunks(self) -> Iterable[tuple[np.ndarray, int]]:
+        "Yields the pattern indices of each chunk and the chunk's number."
+        for i in range(self.chunk_count):
+            yield np.load(self.directory / f"{i}.npy", mmap_mode="r"), i
+
+    def product(self, x: np.ndarray) -> list[np.ndarray]:
+        "Returns A x, per chunk."
+        return [x[indices].sum(axis=1) for indices, _ in self.chunks()]
+
+    def transposed_product(self, r: list[np.ndarray]) -> np.ndarray:
+        "Returns A^T r."
+        result = np.zeros(weight_count)
+        for indices, i in self.chunks():
+            result += np.bincount(
+                indices.ravel(),
+                weights=np.repeat(r[i], indices.shape[1]),
+                minlength=weight_count,
+            )
+        return result
+
+
+def least_squares(data: StageData, iterations: int, regularization: float) -> np.ndarray:
+    "Returns x minimizing |A x - b|^2 + regularization * |x|^2, by conjugate gradients (CGLS)."
+    x = np.zeros(weight_count)
+    r = [scores.copy() for scores in data.scores]
+    s = data.transposed_product(r)
+    p = s.copy()
+    gamma = s @ s
+    for _ in range(iterations):
+        if gamma == 0:
+            break
+        q = data.product(p)
+        alpha = gamma / (sum(qi @ qi for qi in q) + regularization * (p @ p))
+        x += alpha * p
+        for ri, qi in zip(r, q):
+            ri -= alpha * qi
+        s = data.transposed_product(r) - regularization * x
+        gamma, old_gamma = s @ s, gamma
+        p = s + (gamma / old_gamma) * p
+    return x
+
+
+def fitted_weights(
+    scored_games: Iterable[ScoredGame],
+    stage_count: int = 16,
+    iterations: int = 100,
+    regularization: float = 5.0,
+    batch_size: int = 1 << 16,
+) -> np.ndarray:
+    """
+    Returns pattern weights of shape (stage_count, weight_count), fitted per stage by
+    regularized least squares to the defined scores of the games.
+    The games are streamed and their pattern indices kept on disk,
+    so memory holds only one batch of indices and one score per position.
+    """
+    weights = np.zeros((stage_count, weight_count), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as directory:
+        data = []
+        for s in range(stage_count):
+            (Path(directory) / str(s)).mkdir()
+            data.append(StageData(Path(directory) / str(s)))
+
+        for batch, scores in scored_position_batches(scored_games, batch_size):
+            indices = batch_pattern_indices(batch.player, batch.opponent)
+            stages = stage(batch.empty_count(), stage_count)
+            for s in np.unique(stages):
+                data[s].append(indices[stages == s], scores[stages == s])
+
+        for s in range(stage_count):
+            if data[s].chunk_count:
+                weights[s] = least_squares(data[s], iterations, regularization)
+    return weights
+
+
+def train(
+    file_paths: Iterable[Path | str], weights_path: Path | str, **kwargs
+) -> np.ndarray:
+    "Fits pattern weights to the scored games of files and writes them to a weights file."
+    weights = fitted_weights(scored_games_of(file_paths), **kwargs)
+    write_weights(weights_path, weights)
+    return weights
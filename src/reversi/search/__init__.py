@@ -1,8 +1,18 @@
 "Search algorithms."
 from reversi.game import *
 from .alpha_beta import *
+from .cutters import *
+from .endgame import *
 from .hashtable import *
+from .in_place_principal_variation import *
+from .iterative_deepening import *
+from .lazy_smp import *
 from .move_sorters import *
+from .mtdf import *
 from .negamax import *
+from .parallel_principal_variation import *
 from .principal_variation import *
+from .probcut import *
 from .result import *
+from .shared_hashtable import *
+from .timed_player import *
@@ -0,0 +1,23 @@
+"Cutters for PrincipalVariation."
+from reversi.game import (
+    OpenInterval,
+    ClosedInterval,
+    Intensity,
+    Field,
+    Position,
+    min_score,
+    stable_discs_bitboard,
+)
+from .result import Result
+
+
+def stability_cutter(pos: Position, window: OpenInterval, intensity: Intensity) -> Result | None:
+    "Returns a fail low result if the opponent's stable discs bound the score to window.lower."
+    # The opponent's discs bound the stable discs, which is cheap to check first.
+    if 64 - 2 * int(pos.opponent).bit_count() > window.lower:
+        return None
+    stable = stable_discs_bitboard(int(pos.opponent), int(pos.player))
+    upper = 64 - 2 * stable.bit_count()
+    if upper <= window.lower:
+        return Result(ClosedInterval(min_score, upper), Intensity(pos.empty_count()), Field.PS)
+    return None
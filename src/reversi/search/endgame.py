@@ -0,0 +1,189 @@
+"Endgame solver for positions with few empty fields."
+from reversi.game import (
+    OpenInterval,
+    ClosedInterval,
+    Intensity,
+    Field,
+    Position,
+    flips_bitboard,
+    min_score,
+    max_score,
+    inf_score,
+)
+from .result import Result
+
+# Maps a field's bitboard to a bit for its quadrant.
+quadrant = {1 << i: 1 << ((i >> 2 & 1) | (i >> 4 & 2)) for i in range(64)}
+
+
+def final_score(player: int, empty_count: int) -> int:
+    "Returns the end score of a terminal position, with the empty fields going to the winner."
+    p = player.bit_count()
+    o = 64 - empty_count - p
+    if p > o:
+        return 64 - 2 * o
+    elif p < o:
+        return 2 * p - 64
+    else:
+        return 0
+
+
+def parity_sorted(empties: list[int], parity: int) -> list[int]:
+    "Returns the empty fields, those in quadrants with an odd number of empties first."
+    odd = [x for x in empties if parity & quadrant[x]]
+    if len(odd) == len(empties):
+        return empties
+    return odd + [x for x in empties if not parity & quadrant[x]]
+
+
+class EndgameSolver:
+    """
+    Alpha-beta search for the last few empty fields.
+    It keeps a list of the empty fields instead of generating moves, orders them by
+    quadrant parity, uses no hash table and has dedicated routines for the last 3 empties.
+    """
+
+    def __init__(self) -> None:
+        self.nodes = 0
+
+    def solve(self, pos: Position, window: OpenInterval | None = None) -> Result:
+        "Solve a position."
+        window = window or OpenInterval(min_score, max_score)
+        player = int(pos.player)
+        opponent = int(pos.opponent)
+        empty_fields = int(pos.empties())
+        empties = [1 << i for i in range(64) if (empty_fields >> i) & 1]
+        parity = 0
+        for x in empties:
+            parity ^= quadrant[x]
+
+        self.nodes += 1
+        alpha = window.lower
+        best_score = -inf_score
+        best_move = Field.PS
+        for x in parity_sorted(empties, parity):
+            flips = flips_bitboard(player, opponent, x)
+            if flips:
+                score = -self.search(
+                    opponent ^ flips,
+                    player ^ flips ^ x,
+                    -window.upper,
+                    -alpha,
+                    [e for e in empties if e != x],
+                    parity ^ quadrant[x],
+                )
+                if score > best_score:
+                    best_score = score
+                    best_move = Field(x.bit_length() - 1)
+                    if score >= window.upper:
+                        break
+                    alpha = max(alpha, score)
+        if best_score == -inf_score:
+            best_score = self.pass_or_end(
+                player, opponent, window.lower, window.upper, empties, parity
+            )
+
+        if best_score <= window.lower:
+            result_window = ClosedInterval(min_score, best_score)
+        elif best_score >= window.upper:
+            result_window = ClosedInterval(best_score, max_score)
+        else:
+            result_window = ClosedInterval(best_score, best_score)
+        return Result(result_window, Intensity(len(empties)), best_move)
+
+    def pass_or_end(
+        self, player: int, opponent: int, alpha: int, beta: int, empties: list[int], parity: int
+    ) -> int:
+        "Returns the fail-soft score of a position in which the player has to pass."
+        if any(flips_bitboard(opponent, player, x) for x in empties):
+            return -self.search(opponent, player, -beta, -alpha, empties, parity)
+        return final_score(player, len(empties))
+
+    def search(
+        self, player: int, opponent: int, alpha: int, beta: int, empties: list[int], parity: int
+    ) -> int:
+        "Returns the fail-soft score."
+        if len(empties) == 3:
+            return self.last_3(player, opponent, alpha, beta, *parity_sorted(empties, parity))
+        if len(empties) == 2:
+            return self.last_2(player, opponent, alpha, beta, *empties)
+        if len(empties) == 1:
+            return self.last_1(player, opponent, empties[0])
+        if len(empties) == 0:
+            self.nodes += 1
+            return final_score(player, 0)
+
+        self.nodes += 1
+        best_score = -inf_score
+        for x in parity_sorted(empties, parity):
+            flips = flips_bitboard(player, opponent, x)
+            if flips:
+                score = -self.search(
+                    opponent ^ flips,
+                    player ^ flips ^ x,
+                    -beta,
+                    -alpha,
+                    [e for e in empties if e != x],
+                    parity ^ quadrant[x],
+                )
+                if score >= beta:  # beta cut
+                    return score
+                best_score = max(best_score, score)
+                alpha = max(alpha, score)
+        if best_score == -inf_score:
+            return self.pass_or_end(player, opponent, alpha, beta, empties, parity)
+        return best_score
+
+    def last_3(
+        self, player: int, opponent: int, alpha: int, beta: int, x1: int, x2: int, x3: int
+    ) -> int:
+        "Returns the fail-soft score with 3 empty fields."
+        self.nodes += 1
+        best_score = -inf_score
+        for x, y, z in ((x1, x2, x3), (x2, x1, x3), (x3, x1, x2)):
+            flips = flips_bitboard(player, opponent, x)
+            if flips:
+                score = -self.last_2(opponent ^ flips, player ^ flips ^ x, -beta, -alpha, y, z)
+                if score >= beta:  # beta cut
+                    return score
+                best_score = max(best_score, score)
+                alpha = max(alpha, score)
+        if best_score == -inf_score:
+            if (
+                flips_bitboard(opponent, player, x1)
+                or flips_bitboard(opponent, player, x2)
+                or flips_bitboard(opponent, player, x3)
+            ):
+                return -self.last_3(opponent, player, -beta, -alpha, x1, x2, x3)
+            return final_score(player, 3)
+        return best_score
+
+    def last_2(self, player: int, opponent: int, alpha: int, beta: int, x1: int, x2: int) -> int:
+        "Returns the fail-soft score with 2 empty fields."
+        self.nodes += 1
+        best_score = -inf_score
+        flips = flips_bitboard(player, opponent, x1)
+        if flips:
+            best_score = -self.last_1(opponent ^ flips, player ^ flips ^ x1, x2)
+            if best_score >= beta:  # beta cut
+                return best_score
+        flips = flips_bitboard(player, opponent, x2)
+        if flips:
+            best_score = max(best_score, -self.last_1(opponent ^ flips, player ^ flips ^ x2, x1))
+        if best_score == -inf_score:
+            if flips_bitboard(opponent, player, x1) or flips_bitboard(opponent, player, x2):
+                return -self.last_2(opponent, player, -beta, -alpha, x1, x2)
+            return final_score(player, 2)
+        return best_score
+
+    def last_1(self, player: int, opponent: int, x: int) -> int:
+        "Returns the score with 1 empty field, by counting flips instead of playing the move."
+        self.nodes += 1
+        p = player.bit_count()
+        flip_count = flips_bitboard(player, opponent, x).bit_count()
+        if flip_count:
+            return 2 * (p + flip_count + 1) - 64
+        flip_count = flips_bitboard(opponent, player, x).bit_count()
+        if flip_count:
+            return 2 * (p - flip_count) - 64
+        return final_score(player, 1)
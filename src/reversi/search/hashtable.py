@@ -1,58 +1,150 @@
 "Hash table for storing search results."
 
-from reversi.game import Position
+import numpy as np
+from reversi.game import (
+    ClosedInterval,
+    Field,
+    Intensity,
+    Position,
+    full_bitboard,
+    countr_zero,
+)
+from reversi.board.bitboard import (
+    flipped_codiagonal as bb_flipped_codiagonal,
+    flipped_diagonal as bb_flipped_diagonal,
+    flipped_horizontal as bb_flipped_horizontal,
+    flipped_vertical as bb_flipped_vertical,
+)
 from .result import Result
 
-
-class Bucket:
-    "A bucket in a hash table."
-
-    def __init__(self, pos: Position = Position(), result: Result = Result()):
-        self.pos = pos
-        self.result = result
-
-    def update(
-        self,
-        pos: Position,
-        new_result: Result,
-    ) -> bool:
-        "Update the bucket with a new result. Return whether the result was updated."
-        self.pos = pos
-        self.result = new_result
-        return True
-
-    def look_up(self, pos: Position) -> Result | None:
-        "Return the result for a position or None."
-        if pos == self.pos:
-            return self.result
-        return None
-
-    def clear(self) -> None:
-        "Clear the bucket."
-        self.pos = Position()
-        self.result = Result()
+entry_dtype = np.dtype(
+    [
+        ("player", np.uint64),
+        ("opponent", np.uint64),
+        ("lower", np.int8),
+        ("upper", np.int8),
+        ("depth", np.int8),
+        ("confidence_level", np.float64),
+        ("best_move", np.uint8),
+        ("generation", np.uint8),
+    ]
+)
+
+# Player and opponent can't both own every field, so this marks an empty entry.
+empty_entry = (full_bitboard, full_bitboard, 0, 0, -1, 0.0, Field.PS.value, 0)
+
+# The 8 symmetries of the board, like in 'flipped_to_unique'.
+symmetries = [
+    lambda b: b,
+    bb_flipped_codiagonal,
+    bb_flipped_diagonal,
+    bb_flipped_horizontal,
+    bb_flipped_vertical,
+    lambda b: bb_flipped_vertical(bb_flipped_codiagonal(b)),
+    lambda b: bb_flipped_vertical(bb_flipped_diagonal(b)),
+    lambda b: bb_flipped_vertical(bb_flipped_horizontal(b)),
+]
+# Per symmetry, the image of each field's value, and the preimage. Passing maps to passing.
+field_images = [[countr_zero(sym(1 << i)) for i in range(64)] + [64] for sym in symmetries]
+field_preimages = [[image.index(i) for i in range(65)] for image in field_images]
+
+
+def canonical(pos: Position) -> tuple[Position, int]:
+    "Returns the symmetric variant of a position 'flipped_to_unique' picks, and its symmetry."
+    p, o = int(pos.player), int(pos.opponent)
+    key, index = min(((sym(p), sym(o)), i) for i, sym in enumerate(symmetries))
+    return Position(*key), index
 
 
 class HashTable:
-    "A hash table for storing search results."
-
-    def __init__(self, size: int) -> None:
-        self.buckets = [Bucket()] * size
+    """
+    A hash table for storing search results.
+    Each bucket has two entries: One that prefers deeper results and one that is always replaced.
+    Optionally, positions with many empties share an entry with their symmetric variants.
+    """
+
+    def __init__(self, size: int, symmetric_empty_count: int | None = None) -> None:
+        """
+        size: Number of buckets.
+        symmetric_empty_count: Positions with more empties are stored as their canonical
+                               symmetric variant, with the best move transformed alike.
+                               None stores every position as it is.
+        """
+        self.entries = np.empty((size, 2), dtype=entry_dtype)
+        self.generation = 0
+        self.symmetric_empty_count = symmetric_empty_count
+        self.clear()
+
+    @staticmethod
+    def from_megabytes(
+        megabytes: float, symmetric_empty_count: int | None = None
+    ) -> "HashTable":
+        "Returns a hash table that uses about the given amount of memory."
+        bucket_size = 2 * entry_dtype.itemsize
+        size = max(1, int(megabytes * 1024 * 1024) // bucket_size)
+        return HashTable(size, symmetric_empty_count)
+
+    def __index(self, pos: Position) -> int:
+        # Maps the 64 bit hash key to [0, size) using its well mixed high bits.
+        return (pos.hash_key * len(self.entries)) >> 64
+
+    def __stored(self, pos: Position) -> tuple[Position, int]:
+        "Returns the position as it's stored, and the symmetry that maps it there."
+        if self.symmetric_empty_count is None or pos.empty_count() <= self.symmetric_empty_count:
+            return pos, 0
+        return canonical(pos)
 
     def update(self, pos: Position, new_result: Result) -> bool:
         "Update the hash table with a new result. Return whether the result was updated."
-        index = hash(pos) % len(self.buckets)
-        return self.buckets[index].update(pos, new_result)
+        pos, symmetry = self.__stored(pos)
+        index = self.__index(pos)
+        bucket = self.entries[index]
+        deep, _ = bucket.tolist()
+        key = (int(pos.player), int(pos.opponent))
+        new = (
+            *key,
+            new_result.window.lower,
+            new_result.window.upper,
+            new_result.intensity.depth,
+            new_result.intensity.confidence_level,
+            field_images[symmetry][new_result.best_move.value],
+            self.generation,
+        )
+
+        if (
+            deep[:2] == key
+            or deep[7] != self.generation
+            or (new[4], new[5]) >= (deep[4], deep[5])
+        ):
+            if deep[:2] != key:
+                bucket[1] = deep  # demote, which also overwrites an older copy of 'pos'
+            bucket[0] = new
+        else:
+            bucket[1] = new
+        return True
 
     def look_up(self, pos: Position) -> Result | None:
         "Return the result for a position or None."
-        index = hash(pos) % len(self.buckets)
-        return self.buckets[index].look_up(pos)
+        pos, symmetry = self.__stored(pos)
+        key = (int(pos.player), int(pos.opponent))
+        for entry in self.entries[self.__index(pos)].tolist():
+            if entry[:2] == key:
+                _, _, lower, upper, depth, confidence_level, best_move, _ = entry
+                return Result(
+                    ClosedInterval(lower, upper),
+                    Intensity(depth, confidence_level),
+                    Field(field_preimages[symmetry][best_move]),
+                )
+        return None
+
+    def new_generation(self) -> None:
+        "Start a new search. Entries of older searches are replaced first."
+        self.generation = (self.generation + 1) % 256
 
     def clear(self) -> None:
         "Clear the hash table."
-        for bucket in self.buckets:
-            bucket.clear()
+        self.entries[:] = empty_entry
+        self.generation = 0
 
 
 class HashTableStub:
@@ -65,5 +157,8 @@ class HashTableStub:
     def look_up(self, *_) -> None:
         "Return the result for a position or None."
 
+    def new_generation(self) -> None:
+        "Start a new search."
+
     def clear(self) -> None:
         "Clear the hash table."
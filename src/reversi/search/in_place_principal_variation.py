@@ -0,0 +1,148 @@
+"Principal variation search on a board that is changed in place."
+from reversi.game import (
+    OpenInterval,
+    ClosedInterval,
+    Intensity,
+    Field,
+    MutableBoard,
+    Position,
+    min_score,
+    max_score,
+    inf_score,
+)
+from .result import Result
+
+
+def bits(b: int):
+    "Yields the set bits of a bitboard, each as a bitboard."
+    while b:
+        x = b & -b
+        yield x
+        b ^= x
+
+
+class InPlacePrincipalVariation:
+    """
+    Principal variation search on a single MutableBoard.
+    Scores and windows are plain ints, only the root returns a Result.
+    """
+
+    def __init__(self, sort_empty_count: int = 5) -> None:
+        """
+        sort_empty_count: Moves are sorted by mobility, in nodes with at least this many empties.
+        """
+        self.nodes = 0
+        self.sort_empty_count = sort_empty_count
+        self.board = MutableBoard(Position())
+
+    def eval(self, pos: Position, window: OpenInterval | None = None) -> Result:
+        "Evaluate a position."
+        window = window or OpenInterval(min_score, max_score)
+        self.board = MutableBoard(pos)
+        score, best_move = self.root(window.lower, window.upper)
+        if score <= window.lower:
+            result_window = ClosedInterval(min_score, score)
+        elif score >= window.upper:
+            result_window = ClosedInterval(score, max_score)
+        else:
+            result_window = ClosedInterval(score, score)
+        return Result(result_window, Intensity(pos.empty_count()), best_move)
+
+    def sorted_moves(self, moves: int) -> list[int]:
+        "Returns the moves, sorted by the opponent's mobility if there are enough empties."
+        board = self.board
+        if board.empty_count() < self.sort_empty_count:
+            return list(bits(moves))
+        mobility = []
+        for x in bits(moves):
+            flips = board.play(x)
+            mobility.append((board.possible_moves().bit_count(), x))
+            board.undo(x, flips)
+        return [x for _, x in sorted(mobility)]
+
+    def root(self, alpha: int, beta: int) -> tuple[int, Field]:
+        "Returns the score and the best move."
+        self.nodes += 1
+        board = self.board
+        moves = board.possible_moves()
+        if not moves:
+            board.play_pass()
+            if board.possible_moves():
+                score = -self.pvs(-beta, -alpha)
+                board.play_pass()
+                return score, Field.PS
+            board.play_pass()
+            return board.end_score(), Field.PS
+
+        best_score = -inf_score
+        best_move = Field.PS
+        for x in self.sorted_moves(moves):
+            flips = board.play(x)
+            if best_score == -inf_score:
+                score = -self.pvs(-beta, -alpha)
+            else:
+                score = -self.zws(-alpha - 1)
+                if alpha < score < beta:
+                    score = -self.pvs(-beta, -score)
+            board.undo(x, flips)
+            if score > best_score:
+                best_score = score
+                best_move = Field(x.bit_length() - 1)
+            if score >= beta:
+                break
+            alpha = max(alpha, score)
+        return best_score, best_move
+
+    def pvs(self, alpha: int, beta: int) -> int:
+        "Principal variation search. Returns a fail-soft score."
+        self.nodes += 1
+        board = self.board
+        moves = board.possible_moves()
+        if not moves:
+            board.play_pass()
+            if board.possible_moves():
+                score = -self.pvs(-beta, -alpha)
+                board.play_pass()
+                return score
+            board.play_pass()
+            return board.end_score()
+
+        best_score = -inf_score
+        for x in self.sorted_moves(moves):
+            flips = board.play(x)
+            if best_score == -inf_score:
+                score = -self.pvs(-beta, -alpha)
+            else:
+                score = -self.zws(-alpha - 1)
+                if alpha < score < beta:
+                    score = -self.pvs(-beta, -score)
+            board.undo(x, flips)
+            if score >= beta:  # beta cut
+                return score
+            best_score = max(best_score, score)
+            alpha = max(alpha, score)
+        return best_score
+
+    def zws(self, alpha: int) -> int:
+        "Zero-window search in (alpha, alpha + 1). Returns a fail-soft score."
+        self.nodes += 1
+        board = self.board
+        moves = board.possible_moves()
+        if not moves:
+            board.play_pass()
+            if board.possible_moves():
+                score = -self.zws(-alpha - 1)
+                board.play_pass()
+                return score
+            board.play_pass()
+            return board.end_score()
+
+        best_score = -inf_score
+        for x in self.sorted_moves(moves):
+            flips = board.play(x)
+            score = -self.zws(-alpha - 1)
+            board.undo(x, flips)
+            if score > alpha:  # beta cut
+                return score
+            best_score = max(best_score, score)
+        return best_score
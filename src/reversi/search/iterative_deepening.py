@@ -0,0 +1,140 @@
+"Iterative deepening with aspiration windows."
+from reversi.game import OpenInterval, Intensity, Position, min_score, max_score
+from .hashtable import HashTable
+from .move_sorters import sorted_by_mobility_and_tt
+from .mtdf import MTDf
+from .principal_variation import PrincipalVariation
+from .probcut import MultiProbCut
+from .result import Result
+
+# Confidence levels of Edax's selectivities 73, 87, 95, 98 and 99.
+edax_confidence_levels = (1.1, 1.5, 2.0, 2.6, 3.3)
+
+
+def guess_of(result: Result) -> int:
+    "Returns the score a result suggests: its bound, or the middle of its window."
+    if result.window.lower == min_score:
+        return result.window.upper
+    if result.window.upper == max_score:
+        return result.window.lower
+    return (result.window.lower + result.window.upper) // 2
+
+
+class IterativeDeepening:
+    """
+    Searches a position with increasing intensity: shallow depths first, then the selective
+    levels, then the requested intensity. Each iteration leaves its best moves in the hash
+    table, which orders the moves of the next one. From the second iteration on, the search
+    uses an aspiration window around the previous score.
+    Without a MultiProbCut, the first selective level would already be exact, so a search
+    without one has no selective levels by default.
+    """
+
+    def __init__(
+        self,
+        search: PrincipalVariation | None = None,
+        aspiration_width: int = 4,
+        confidence_levels: tuple[float, ...] | None = None,
+        solve_margin: int = 10,
+        max_time: float | None = None,
+        max_nodes: int | None = None,
+        mtdf: bool = False,
+    ) -> None:
+        """
+        search: A search whose move sorter uses its hash table.
+                Defaults to a PrincipalVariation with sorted_by_mobility_and_tt.
+        aspiration_width: Half width of the first aspiration window.
+        confidence_levels: Selective levels to search before the requested intensity.
+                           Defaults to edax_confidence_levels if the search has a
+                           MultiProbCut, and to none otherwise.
+        solve_margin: When solving, depth limited iterations stop this many empties short
+                      of the end, since they would cost about as much as the solve.
+        max_time: Seconds after which 'eval' aborts, for all iterations together.
+        max_nodes: Number of nodes after which 'eval' aborts, for all iterations together.
+        mtdf: Whether iterations after the first converge by MTD(f) from the previous score,
+              instead of by aspiration windows.
+        """
+        if search is None:
+            tt = HashTable.from_megabytes(16)
+            search = PrincipalVariation(sorted_by_mobility_and_tt(tt), tt)
+        if confidence_levels is None:
+            selective = any(isinstance(c, MultiProbCut) for c in search.cutters)
+            confidence_levels = edax_confidence_levels if selective else ()
+        self.search = search
+        self.aspiration_width = aspiration_width
+        self.confidence_levels = confidence_levels
+        self.solve_margin = solve_margin
+        self.max_time = max_time
+        self.max_nodes = max_nodes
+        self.mtdf = MTDf(search) if mtdf else None
+
+    @property
+    def nodes(self) -> int:
+        "Returns the number of nodes searched."
+        return self.search.nodes
+
+    def intensities(self, pos: Position, intensity: Intensity) -> list[Intensity]:
+        "Returns the intensities of the iterations, ending with the requested one."
+        empty_count = pos.empty_count()
+        depth = min(intensity.depth, empty_count)
+        ret = []
+        if self.search.evaluator:
+            last = depth if depth < empty_count else empty_count - self.solve_margin
+            ret += [Intensity(d, intensity.confidence_level) for d in range(1, last)]
+        ret += [
+            Intensity(depth, c) for c in self.confidence_levels if c < intensity.confidence_level
+        ]
+        ret.append(Intensity(depth, intensity.confidence_level))
+        return ret
+
+    def eval(
+        self,
+        pos: Position,
+        window: OpenInterval | None = None,
+        intensity: Intensity | None = None,
+    ) -> Result:
+        """
+        Evaluate a position. Returns the result of the last iteration.
+        If the budget runs out, it returns the result of the last completed iteration,
+        whose intensity tells how far the search got.
+        """
+        window = window or OpenInterval(min_score, max_score)
+        intensity = intensity or Intensity(pos.empty_count())
+        self.search.start_budget(self.max_time, self.max_nodes)
+        result = None
+        for i in self.intensities(pos, intensity):
+            if result is None:
+                new_result = self.search.budgeted_eval(
+                    pos, OpenInterval(window.lower, window.upper), i
+                )
+            elif self.mtdf:
+                new_result = self.mtdf.converge(pos, window, i, guess_of(result))
+            else:
+                new_result = self.aspiration_search(pos, window, i, result)
+            if self.search.aborted:
+                result = result or new_result
+                break
+            result = new_result
+        result.pv = self.search.principal_variation(pos, result)
+        return result
+
+    def aspiration_search(
+        self, pos: Position, window: OpenInterval, intensity: Intensity, guess: Result
+    ) -> Result:
+        "Searches a window around the guess, widening it on fail high or fail low."
+        score = guess_of(guess)
+        lower_width = upper_width = self.aspiration_width
+        while True:
+            lower = max(window.lower, min(score - lower_width, window.upper - 1))
+            upper = min(window.upper, max(score + upper_width, window.lower + 1))
+            result = self.search.budgeted_eval(pos, OpenInterval(lower, upper), intensity)
+            if self.search.aborted:
+                return result
+            if result.window.upper <= lower and lower > window.lower:  # fail low
+                lower_width *= 2
+                score = min(score, result.window.upper)
+            elif result.window.lower >= upper and upper < window.upper:  # fail high
+                upper_width *= 2
+                score = max(score, result.window.lower)
+            else:
+                return result
@@ -0,0 +1,75 @@
+"Lazy SMP: Several processes search the same position and share a hash table."
+from multiprocessing import Process, Queue, cpu_count
+from random import Random
+from reversi.game import OpenInterval, Intensity, Position, Moves
+from .move_sorters import sorted_by_mobility_and_tt
+from .principal_variation import PrincipalVariation
+from .result import Result
+from .shared_hashtable import SharedHashTable
+
+
+def with_shuffled_ties(move_sorter, seed: int):
+    "Returns the move sorter, but with moves of equal rank in a random order."
+    rng = Random(seed)
+
+    def sorter(pos: Position, moves: Moves):
+        moves = list(moves)
+        rng.shuffle(moves)
+        return move_sorter(pos, moves)  # sorting is stable, so the shuffle breaks ties
+
+    return sorter
+
+
+def search_worker(
+    tt: SharedHashTable,
+    seed: int,
+    pos: Position,
+    window: OpenInterval | None,
+    intensity: Intensity | None,
+    queue: Queue,
+) -> None:
+    "Searches a position and puts the result and the number of nodes into the queue."
+    move_sorter = sorted_by_mobility_and_tt(tt)
+    if seed:
+        move_sorter = with_shuffled_ties(move_sorter, seed)
+    search = PrincipalVariation(move_sorter, tt)
+    result = search.eval(pos, window, intensity)
+    queue.put((result, search.nodes))
+
+
+class LazySMP:
+    "Searches a position with several processes that share a hash table."
+
+    def __init__(self, workers: int | None = None, hash_table_size: int = 1_000_000) -> None:
+        """
+        workers: Number of processes, defaults to the number of CPUs.
+        hash_table_size: Number of entries in the shared hash table.
+        """
+        self.nodes = 0
+        self.workers = workers or cpu_count()
+        self.tt = SharedHashTable(hash_table_size)
+
+    def eval(
+        self,
+        pos: Position,
+        window: OpenInterval | None = None,
+        intensity: Intensity | None = None,
+    ) -> Result:
+        "Evaluate a position. Returns the result of the first process to finish."
+        queue: Queue = Queue()
+        processes = [
+            Process(target=search_worker, args=(self.tt, seed, pos, window, intensity, queue))
+            for seed in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        result, nodes = queue.get()
+        for process in processes:
+            process.terminate()
+            process.join()
+        self.nodes += nodes
+        return result
+
+    def close(self) -> None:
+        "Free the shared hash table."
+        self.tt.close()
@@ -1,5 +1,18 @@
 "Move sorters."
-from reversi.game import Position, Field, Moves, possible_moves, play
+from dataclasses import dataclass
+from typing import Sequence
+from reversi.game import (
+    Position,
+    Field,
+    Intensity,
+    Moves,
+    possible_moves,
+    possible_moves_bitboard,
+    flips_bitboard,
+    play,
+    full_bitboard,
+)
+from .endgame import quadrant
 from .hashtable import HashTable
 
 
@@ -22,3 +35,160 @@ def sorted_by_mobility_and_tt(tt: HashTable):
         )
 
     return sorter
+
+
+class HistorySorter:
+    """
+    Sorts moves by the hash table's best move, then the killer moves, then the history of
+    beta cuts, without playing the moves. Where much depth remains to be searched,
+    the order matters more than its cost, so it sorts by mobility instead.
+    The remaining depth counts the plies to the leaves of the search, where the evaluator
+    or the endgame solver takes over.
+    In searches to the end of the game, history ordering costs nodes compared to mobility
+    ordering, so they use 'solve_history_depth', which sorts every node by mobility by default.
+    PrincipalVariation updates the history and the killer moves on beta cuts.
+    """
+
+    def __init__(
+        self,
+        tt: HashTable | None = None,
+        history_depth: int = 2,
+        solve_history_depth: int = 0,
+    ) -> None:
+        """
+        tt: Hash table whose best move is sorted first.
+        history_depth: Nodes with less remaining depth are sorted by history.
+        solve_history_depth: history_depth of searches to the end of the game.
+        """
+        self.tt = tt
+        self.history_depth = history_depth
+        self.solve_history_depth = solve_history_depth
+        self.search_history_depth = history_depth
+        self.root_empty_count = 60
+        self.root_depth = 60
+        self.clear()
+
+    def new_search(
+        self, pos: Position, intensity: Intensity, leaf_empty_count: int = 0
+    ) -> None:
+        """
+        Marks the position as the root of a search of the given intensity.
+        leaf_empty_count: Empty count at which the search hands over to an endgame solver.
+        """
+        self.root_empty_count = pos.empty_count()
+        self.root_depth = min(intensity.depth, self.root_empty_count - leaf_empty_count)
+        if intensity.depth >= self.root_empty_count:
+            self.search_history_depth = self.solve_history_depth
+        else:
+            self.search_history_depth = self.history_depth
+
+    def clear(self) -> None:
+        "Forgets the history and the killer moves."
+        # Indexed by empty count and move.
+        self.history = [[0] * 65 for _ in range(65)]
+        self.killers = [[Field.PS, Field.PS] for _ in range(65)]
+
+    def beta_cut(self, pos: Position, move: Field, depth: int) -> None:
+        "Records a move that caused a beta cut in a search of the given depth."
+        empty_count = pos.empty_count()
+        self.history[empty_count][move.value] += depth * depth
+        killers = self.killers[empty_count]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+    def __call__(self, pos: Position, moves: Moves) -> list[Field]:
+        t = self.tt.look_up(pos) if self.tt else None
+        tt_move = t.best_move if t else Field.PS
+        empty_count = pos.empty_count()
+        remaining_depth = self.root_depth - (self.root_empty_count - empty_count)
+        if remaining_depth >= self.search_history_depth:
+            return sorted(
+                moves,
+                key=lambda move: -1
+                if move == tt_move
+                else len(possible_moves(play(pos, move))),
+            )
+
+        history = self.history[empty_count]
+        killer_1, killer_2 = self.killers[empty_count]
+
+        def key(move: Field) -> tuple[int, int]:
+            if move == tt_move:
+                return (0, 0)
+            if move == killer_1:
+                return (1, 0)
+            if move == killer_2:
+                return (2, 0)
+            return (3, -history[move.value])
+
+        return sorted(moves, key=key)
+
+
+@dataclass
+class OrderingWeights:
+    "Weights of the terms of fastest-first ordering. Moves with a lower sum are searched first."
+
+    mobility: int = 16
+    potential_mobility: int = 4
+    corner: int = -8
+    x_square: int = 8
+    odd_quadrant: int = -4
+
+
+def neighbours(b: int) -> int:
+    "Returns the fields next to the given fields, including them."
+    b |= ((b << 1) & 0xFEFEFEFEFEFEFEFE) | ((b >> 1) & 0x7F7F7F7F7F7F7F7F)
+    return (b | (b << 8) | (b >> 8)) & full_bitboard
+
+
+corners = 0x8100000000000081
+# Maps each corner to its diagonal neighbour.
+x_squares = {1 << 0: 1 << 9, 1 << 7: 1 << 14, 1 << 56: 1 << 49, 1 << 63: 1 << 54}
+quadrants = [sum(x for x, q in quadrant.items() if q == 1 << i) for i in range(4)]
+
+
+def sorted_fastest_first(
+    tt: HashTable | None = None,
+    stage_weights: Sequence[OrderingWeights] = (OrderingWeights(),),
+):
+    """
+    Sort moves fastest-first: by the opponent's mobility and potential mobility after the move,
+    corner and X-square terms and quadrant parity, with the hash table's best move first.
+    The children are built from bitboards in one pass, without creating positions.
+    'stage_weights' are spread evenly over the empty counts 0 to 60,
+    more empties use the last weights.
+    """
+
+    def sorter(pos: Position, moves: Moves) -> list[Field]:
+        t = tt.look_up(pos) if tt else None
+        tt_move = t.best_move if t else Field.PS
+        player, opponent = int(pos.player), int(pos.opponent)
+        empties = (player | opponent) ^ full_bitboard
+        empty_count = empties.bit_count()
+        w = stage_weights[min(empty_count * len(stage_weights) // 61, len(stage_weights) - 1)]
+        bad_x_squares = sum(x for corner, x in x_squares.items() if empties & corner)
+        odd = sum(q for q in quadrants if (empties & q).bit_count() & 1)
+
+        scored = []
+        for move in moves:
+            if move == tt_move:
+                scored.append((-(1 << 20), move))
+                continue
+            x = 1 << move.value
+            flips = flips_bitboard(player, opponent, x)
+            mine = player | flips | x
+            theirs = opponent ^ flips
+            score = w.mobility * possible_moves_bitboard(theirs, mine).bit_count()
+            score += w.potential_mobility * (neighbours(mine) & empties & ~x).bit_count()
+            if x & corners:
+                score += w.corner
+            elif x & bad_x_squares:
+                score += w.x_square
+            if x & odd:
+                score += w.odd_quadrant
+            scored.append((score, move))
+        scored.sort(key=lambda s: s[0])
+        return [move for _, move in scored]
+
+    return sorter
@@ -0,0 +1,103 @@
+"MTD(f), a search driver of zero window searches."
+from reversi.game import (
+    OpenInterval,
+    ClosedInterval,
+    Intensity,
+    Position,
+    Field,
+    min_score,
+    max_score,
+)
+from .hashtable import HashTable
+from .move_sorters import sorted_fastest_first
+from .principal_variation import PrincipalVariation, SearchAborted
+from .result import Result
+
+
+class MTDf:
+    """
+    Converges on the score of a position by zero window searches, starting from a guess.
+    Each search tests whether the score is at least the current guess, and its bound moves
+    the guess. The hash table keeps the trees of earlier searches, so it's essential.
+    """
+
+    def __init__(self, search: PrincipalVariation | None = None, guess_depth: int = 4) -> None:
+        """
+        search: A search with a hash table.
+                Defaults to a PrincipalVariation with sorted_fastest_first.
+        guess_depth: Depth of the search for a first guess, if the search has an evaluator.
+                     Without one, the first guess is 0.
+        """
+        if search is None:
+            tt = HashTable.from_megabytes(16)
+            search = PrincipalVariation(sorted_fastest_first(tt), tt)
+        self.search = search
+        self.guess_depth = guess_depth
+
+    @property
+    def nodes(self) -> int:
+        "Returns the number of nodes searched."
+        return self.search.nodes
+
+    def eval(
+        self,
+        pos: Position,
+        window: OpenInterval | None = None,
+        intensity: Intensity | None = None,
+        guess: int | None = None,
+    ) -> Result:
+        """
+        Evaluate a position.
+        guess: First guess of the score, e.g. minus the score of the previous position
+               of a ScoredGame. Defaults to the result of a shallow search.
+        """
+        window = window or OpenInterval(min_score, max_score)
+        intensity = intensity or Intensity(pos.empty_count())
+        self.search.start_budget(self.search.max_time, self.search.max_nodes)
+        if guess is None:
+            guess = self.first_guess(pos, intensity)
+        result = self.converge(pos, window, intensity, guess)
+        result.pv = self.search.principal_variation(pos, result)
+        return result
+
+    def first_guess(self, pos: Position, intensity: Intensity) -> int:
+        "Returns the score of a shallow search, or 0 if the search has no evaluator."
+        if not self.search.evaluator or intensity.depth <= self.guess_depth:
+            return 0
+        result = self.search.budgeted_eval(pos, intensity=Intensity(self.guess_depth))
+        return (result.window.lower + result.window.upper) // 2
+
+    def converge(
+        self, pos: Position, window: OpenInterval, intensity: Intensity, guess: int
+    ) -> Result:
+        """
+        Narrows the score down by zero window searches, starting at the guess,
+        until it's exact or outside the window.
+        If the budget runs out, 'search.aborted' is set and the bounds found so far are returned.
+        """
+        lower, upper = min_score, max_score
+        lowest_intensity = intensity
+        best_move = Field.PS
+        self.search.aborted = False
+        if self.search.history:
+            self.search.history.new_search(pos, intensity, self.search.endgame_empty_count)
+        while lower < upper and lower < window.upper and upper > window.lower:
+            beta = min(max(guess, lower + 1), upper)
+            try:
+                result = self.search.zws(pos, OpenInterval(beta - 1, beta), intensity)
+            except SearchAborted:
+                self.search.aborted = True
+                break
+            lowest_intensity = min(lowest_intensity, result.intensity)
+            lower = max(lower, result.window.lower)
+            upper = min(upper, result.window.upper)
+            if result.window.lower >= beta:  # fail high
+                guess = lower
+                best_move = result.best_move
+            else:  # fail low
+                guess = upper
+                if best_move == Field.PS:
+                    best_move = result.best_move
+        if lower == min_score and upper == max_score:
+            return Result()
+        return Result(ClosedInterval(lower, upper), lowest_intensity, best_move)
@@ -0,0 +1,161 @@
+"Parallel principal variation search, which splits the nodes of the principal variation."
+from collections import deque
+from multiprocessing import Pool, cpu_count
+from reversi.game import OpenInterval, Intensity, Position, min_score, max_score
+from reversi.game import possible_moves, play
+from .move_sorters import sorted_fastest_first
+from .principal_variation import PrincipalVariation, Status, beta_cut
+from .result import Result
+from .shared_hashtable import SharedHashTable
+
+# The search of a worker process, which shares the hash table with all others.
+worker_search: PrincipalVariation | None = None
+
+
+def init_worker(tt: SharedHashTable, move_sorter, evaluator) -> None:
+    "Creates the search of a worker process."
+    global worker_search
+    worker_search = PrincipalVariation(move_sorter(tt), tt, evaluator=evaluator)
+
+
+def zws_in_worker(pos: Position, window: OpenInterval, intensity: Intensity) -> tuple[Result, int]:
+    "Searches a zero window in the worker process. Returns the result and the number of nodes."
+    nodes = worker_search.nodes
+    result = worker_search.zws(pos, window, intensity)
+    return result, worker_search.nodes - nodes
+
+
+class ParallelPrincipalVariation:
+    """
+    Principal variation search of one position with several processes, young brothers wait style.
+    At a split node, the first move is searched in this process to get a bound. Then the
+    remaining moves are searched by a pool of worker processes with zero windows at the best
+    bound so far. Only moves that fail high are searched again, in this process,
+    with the full window.
+    The first move of a split node is itself a split node, 'split_depth' plies deep,
+    so the nodes of the principal variation are split. All processes share a hash table.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        hash_table_size: int = 1_000_000,
+        move_sorter=sorted_fastest_first,
+        evaluator=None,
+        split_depth: int = 1,
+        min_split_depth: int = 10,
+    ) -> None:
+        """
+        workers: Number of worker processes, defaults to the number of CPUs.
+        hash_table_size: Number of entries in the shared hash table.
+        move_sorter: Takes a hash table and returns a move sorter, e.g. sorted_fastest_first.
+        evaluator: Evaluates positions where a depth limited search ends.
+        split_depth: Number of plies of the principal variation whose nodes are split.
+                     With 1, only the root moves are searched in parallel.
+        min_split_depth: Nodes with less remaining depth are searched in this process,
+                         since they are too small to pay for the communication.
+        """
+        self.workers = workers or cpu_count()
+        self.tt = SharedHashTable(hash_table_size)
+        self.move_sorter = move_sorter
+        self.evaluator = evaluator
+        self.split_depth = split_depth
+        self.min_split_depth = min_split_depth
+        self.search = PrincipalVariation(move_sorter(self.tt), self.tt, evaluator=evaluator)
+        self.worker_nodes = 0
+        self.pool = None
+
+    @property
+    def nodes(self) -> int:
+        "Returns the number of nodes searched by all processes."
+        return self.search.nodes + self.worker_nodes
+
+    def eval(
+        self,
+        pos: Position,
+        window: OpenInterval | None = None,
+        intensity: Intensity | None = None,
+    ) -> Result:
+        "Evaluate a position."
+        window = window or OpenInterval(min_score, max_score)
+        intensity = intensity or Intensity(pos.empty_count())
+        result = self.split(
+            pos, OpenInterval(window.lower, window.upper), intensity, self.split_depth
+        )
+        result.pv = self.search.principal_variation(pos, result)
+        return result
+
+    def split(
+        self, pos: Position, window: OpenInterval, intensity: Intensity, split_depth: int
+    ) -> Result:
+        "Principal variation search, which splits this node and the first child's."
+        moves = possible_moves(pos)
+        depth = min(intensity.depth, pos.empty_count())
+        if split_depth <= 0 or depth < self.min_split_depth or not moves:
+            return self.search.pvs(pos, window, intensity)
+
+        if tc := self.search.transposition_cut(pos, window, intensity):
+            return tc
+
+        first, *rest = self.search.sorted_moves(pos, moves)
+        status = Status(window.lower)
+        result = -self.split(play(pos, first), -window, intensity - 1, split_depth - 1)
+        if result.window > window:  # beta cut
+            return self.stored(pos, beta_cut(result, first))
+        status.update(result, first)
+        window.lower = max(window.lower, result.window.lower)
+
+        # The younger brothers are searched with the best bound so far. Only one task per worker
+        # is pending, so that later tasks get the bounds of re-searches.
+        pool = self.started_pool()
+        remaining = iter(rest)
+        pending = deque()
+        while True:
+            while len(pending) < self.workers and (move := next(remaining, None)) is not None:
+                zero_window = OpenInterval(window.lower, window.lower + 1)
+                args = (play(pos, move), -zero_window, intensity - 1)
+                pending.append((move, pool.apply_async(zws_in_worker, args)))
+            if not pending:
+                break
+            move, task = pending.popleft()
+            child, nodes = task.get()
+            self.worker_nodes += nodes
+            result = -child
+            if result.window < window:
+                status.update(result, move)
+                continue
+
+            result = -self.search.pvs(play(pos, move), -window, intensity - 1)
+            if result.window > window:  # beta cut
+                # The remaining tasks are of no use, so their processes are stopped.
+                self.stop_workers()
+                return self.stored(pos, beta_cut(result, move))
+            status.update(result, move)
+            window.lower = max(window.lower, result.window.lower)
+
+        return self.stored(pos, status.result())
+
+    def stored(self, pos: Position, result: Result) -> Result:
+        "Stores the result of a split node in the hash table and returns it."
+        self.tt.update(pos, result)
+        return result
+
+    def started_pool(self) -> Pool:
+        "Returns the pool of worker processes, starting it if needed."
+        if self.pool is None:
+            self.pool = Pool(
+                self.workers, init_worker, (self.tt, self.move_sorter, self.evaluator)
+            )
+        return self.pool
+
+    def stop_workers(self) -> None:
+        "Terminates the worker processes. The next split node starts new ones."
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def close(self) -> None:
+        "Terminates the worker processes and frees the shared hash table."
+        self.stop_workers()
+        self.tt.close()
@@ -1,4 +1,6 @@
 "Principal variation search."
+import time
+from typing import Iterable
 from reversi.game import (
     OpenInterval,
     ClosedInterval,
@@ -8,15 +10,22 @@ from reversi.game import (
     max_score,
     inf_score,
     Position,
+    Moves,
     possible_moves,
     play,
     play_pass,
     end_score,
 )
+from .endgame import EndgameSolver
 from .hashtable import HashTableStub
+from .move_sorters import HistorySorter
 from .result import Result
 
 
+class SearchAborted(Exception):
+    "Raised inside a search whose time or node budget is exhausted."
+
+
 class Status:
     "Status of a search."
 
@@ -66,12 +75,44 @@ class PrincipalVariation:
     "Principal variation search."
 
     def __init__(
-        self, move_sorter=None, transposition_table=None, cutters: list | None = None
+        self,
+        move_sorter=None,
+        transposition_table=None,
+        cutters: list | None = None,
+        endgame_empty_count: int = 6,
+        enhanced_transposition_cut: bool = False,
+        evaluator=None,
+        max_time: float | None = None,
+        max_nodes: int | None = None,
     ) -> None:
+        """
+        endgame_empty_count: Positions with at most this many empties are solved by the
+                             EndgameSolver, without move sorter, hash table or cutters.
+        enhanced_transposition_cut: Whether to look up all children in the hash table,
+                                    before searching any of them.
+        evaluator: Evaluates positions where the intensity's depth reaches 0, e.g. a
+                   PatternEvaluator. Without one, the search continues to the end of the game.
+        max_time: Seconds after which 'eval' aborts.
+        max_nodes: Number of nodes after which 'eval' aborts.
+                   It can be exceeded by the nodes of one endgame solve.
+        """
         self.nodes = 0
         self.sorted_moves = move_sorter or (lambda _, x: x)
+        # A HistorySorter learns from the beta cuts of this search.
+        self.history = move_sorter if isinstance(move_sorter, HistorySorter) else None
         self.tt = transposition_table or HashTableStub()
         self.cutters = cutters or []
+        self.endgame_empty_count = endgame_empty_count
+        self.endgame = EndgameSolver()
+        self.etc = enhanced_transposition_cut
+        self.evaluator = evaluator
+        self.max_time = max_time
+        self.max_nodes = max_nodes
+        self.aborted = False
+        self.deadline = float("inf")
+        self.node_limit = float("inf")
+        self.next_check = float("inf")
+        self.stopped = False
 
     def eval(
         self,
@@ -79,16 +120,170 @@ class PrincipalVariation:
         window: OpenInterval | None = None,
         intensity: Intensity | None = None,
     ) -> Result:
-        "Evaluate a position."
-        return self.pvs(
-            pos,
-            window or OpenInterval(min_score, max_score),
-            intensity or Intensity(pos.empty_count()),
-        )
+        """
+        Evaluate a position.
+        If the budget runs out, 'aborted' is set and the result is the hash table's entry of
+        the position, or an empty Result if there is none.
+        """
+        self.start_budget(self.max_time, self.max_nodes)
+        result = self.budgeted_eval(pos, window, intensity)
+        result.pv = self.principal_variation(pos, result)
+        return result
+
+    def solve_wld(self, pos: Position, intensity: Intensity | None = None) -> Result:
+        """
+        Solves whether a position is won, lost or drawn, by searching the window (-1, +1).
+        The result's window is a bound: its lower limit is positive for a win,
+        its upper limit is negative for a loss, and it's [0, 0] for a draw.
+        """
+        return self.eval(pos, OpenInterval(-1, +1), intensity)
+
+    def solve_wld_many(self, pos: Iterable[Position]) -> list[Result]:
+        "Solves whether positions are won, lost or drawn, sharing the hash table."
+        return [self.solve_wld(p) for p in pos]
+
+    def analyze(
+        self, pos: Position, intensity: Intensity | None = None, top_k: int | None = None
+    ) -> list[Result]:
+        """
+        Returns a result per possible move, whose best move is that move, best first.
+        The moves are searched in the move sorter's order, sharing the hash table.
+        Without 'top_k', every move is searched with the full window, to get its exact score.
+        With 'top_k', only the best k moves are searched exactly, the others get an upper bound.
+        Once k moves are exact, each next move is searched with a zero window at the k-th best
+        score, and only searched again if it fails high.
+        If the side to move has to pass, the only result is that of Field.PS.
+        If the game is over, there are no results.
+        If the budget runs out, only the moves searched so far are returned.
+        """
+        intensity = intensity or Intensity(pos.empty_count())
+        self.start_budget(self.max_time, self.max_nodes)
+        if moves := possible_moves(pos):
+            children = [(m, play(pos, m), 1) for m in self.sorted_moves(pos, moves)]
+        elif possible_moves(play_pass(pos)):
+            children = [(Field.PS, play_pass(pos), 0)]  # a pass isn't a ply
+        else:
+            children = []
+        results = []
+        exact_scores = []
+        for move, child_pos, plies in children:
+            child_intensity = intensity - plies
+            window = OpenInterval(min_score, max_score)
+            if top_k and len(exact_scores) >= top_k:
+                lower = sorted(exact_scores, reverse=True)[top_k - 1]
+                zero_window = OpenInterval(lower, lower + 1)
+                child = self.budgeted_eval(child_pos, -zero_window, child_intensity)
+                if not self.aborted and -child.window > zero_window:
+                    window = OpenInterval((-child.window).lower - 1, max_score)
+                else:
+                    window = None
+            if window is not None:
+                child = self.budgeted_eval(child_pos, -window, child_intensity)
+            if self.aborted:
+                break
+            child_pv = self.principal_variation(child_pos, child)
+            result = Result(-child.window, child.intensity + plies, move, (move, *child_pv))
+            if result.is_exact():
+                exact_scores.append(result.window.lower)
+            results.append(result)
+        return sorted(results, key=lambda r: (-r.window.lower, -r.window.upper))
+
+    def start_budget(self, max_time: float | None, max_nodes: int | None) -> None:
+        """
+        Starts a budget, which covers all calls of 'budgeted_eval' until the next start.
+        It also clears an earlier 'stop'.
+        """
+        self.stopped = False
+        self.deadline = float("inf") if max_time is None else time.monotonic() + max_time
+        self.node_limit = float("inf") if max_nodes is None else self.nodes + max_nodes
+        self.next_check = self.nodes
+
+    def budgeted_eval(
+        self,
+        pos: Position,
+        window: OpenInterval | None = None,
+        intensity: Intensity | None = None,
+    ) -> Result:
+        """
+        Evaluate a position within the started budget.
+        The result has no principal variation, since most callers only need its bound.
+        """
+        self.aborted = False
+        if self.history:
+            self.history.new_search(
+                pos, intensity or Intensity(pos.empty_count()), self.endgame_empty_count
+            )
+        try:
+            result = self.pvs(
+                pos,
+                window or OpenInterval(min_score, max_score),
+                intensity or Intensity(pos.empty_count()),
+            )
+        except SearchAborted:
+            self.aborted = True
+            result = self.tt.look_up(pos) or Result()
+        return result
+
+    def principal_variation(self, pos: Position, result: Result) -> tuple[Field, ...]:
+        """
+        Returns the line of best moves of a search result, as many plies deep as the result's
+        intensity, not counting passes.
+        It starts with the result's best move and follows the hash table's best moves.
+        Positions of the endgame solver aren't in the hash table, so they are solved again.
+        """
+        line = []
+        move = result.best_move
+        plies = 0
+        while plies < result.intensity.depth:
+            if not possible_moves(pos):
+                pos = play_pass(pos)
+                if not possible_moves(pos):
+                    break
+                line.append(Field.PS)
+                move = None
+            if move is None:
+                if pos.empty_count() <= self.endgame_empty_count:
+                    move = self.endgame.solve(pos).best_move
+                    self.endgame.nodes = 0
+                else:
+                    t = self.tt.look_up(pos)
+                    move = t.best_move if t else Field.PS
+            if move not in possible_moves(pos):
+                break
+            line.append(move)
+            pos = play(pos, move)
+            plies += 1
+            move = None
+        while line and line[-1] == Field.PS:
+            line.pop()
+        return tuple(line)
+
+    def stop(self) -> None:
+        """
+        Makes a search running in another thread abort within 1024 nodes,
+        and the rest of its budget too. The next 'start_budget' clears it.
+        """
+        self.stopped = True
+        self.next_check = 0
+
+    def count_node(self) -> None:
+        "Counts a node and raises SearchAborted if the budget is exhausted."
+        self.nodes += 1
+        if self.nodes >= self.next_check:
+            # Reading the clock is expensive compared to a node, so it's done every 1024 nodes.
+            if (
+                self.nodes >= self.node_limit
+                or self.stopped
+                or time.monotonic() >= self.deadline
+            ):
+                raise SearchAborted
+            self.next_check = min(self.nodes + 1024, self.node_limit)
 
     def pvs(self, pos: Position, window: OpenInterval, intensity: Intensity) -> Result:
         "Principal variation search."
-        self.nodes += 1
+        if pos.empty_count() <= self.endgame_empty_count:
+            return self.endgame_solve(pos, window)
+        self.count_node()
 
         moves = possible_moves(pos)
         if not moves:
@@ -97,6 +292,9 @@ class PrincipalVariation:
                 return -self.pvs(passed, -window, intensity)
             return end_result(pos)
 
+        if intensity.depth <= 0 and self.evaluator:
+            return self.evaluated(pos)
+
         for cutter in self.cutters:
             if cut := cutter(pos, window, intensity):
                 return cut
@@ -104,6 +302,10 @@ class PrincipalVariation:
         if tc := self.transposition_cut(pos, window, intensity):
             return tc
 
+        if self.etc:
+            if etc := self.enhanced_transposition_cut(pos, moves, window, intensity):
+                return etc
+
         status = Status(window.lower)
         first = True
         for move in self.sorted_moves(pos, moves):
@@ -118,6 +320,8 @@ class PrincipalVariation:
             if result.window > window:  # beta cut
                 ret = beta_cut(result, move)
                 self.tt.update(pos, ret)
+                if self.history:
+                    self.history.beta_cut(pos, move, intensity.depth)
                 return ret
             status.update(result, move)
             window.lower = max(window.lower, result.window.lower)
@@ -129,7 +333,9 @@ class PrincipalVariation:
 
     def zws(self, pos: Position, window: OpenInterval, intensity: Intensity) -> Result:
         "Zero-window search."
-        self.nodes += 1
+        if pos.empty_count() <= self.endgame_empty_count:
+            return self.endgame_solve(pos, window)
+        self.count_node()
 
         moves = possible_moves(pos)
         if not moves:
@@ -138,6 +344,9 @@ class PrincipalVariation:
                 return -self.zws(passed, -window, intensity)
             return end_result(pos)
 
+        if intensity.depth <= 0 and self.evaluator:
+            return self.evaluated(pos)
+
         for cutter in self.cutters:
             if ret := cutter(pos, window, intensity):
                 return ret
@@ -145,12 +354,18 @@ class PrincipalVariation:
         if tc := self.transposition_cut(pos, window, intensity):
             return tc
 
+        if self.etc:
+            if etc := self.enhanced_transposition_cut(pos, moves, window, intensity):
+                return etc
+
         status = Status(window.lower)
         for move in self.sorted_moves(pos, moves):
             result = -self.zws(play(pos, move), -window, intensity - 1)
             if result.window > window:  # beta cut
                 ret = beta_cut(result, move)
                 self.tt.update(pos, ret)
+                if self.history:
+                    self.history.beta_cut(pos, move, intensity.depth)
                 return ret
             status.update(result, move)
 
@@ -158,6 +373,28 @@ class PrincipalVariation:
         self.tt.update(pos, ret)
         return ret
 
+    def enhanced_transposition_cut(
+        self, pos: Position, moves: Moves, window: OpenInterval, intensity: Intensity
+    ) -> Result | None:
+        "Returns a beta cut result if a child's hash table entry proves one. None otherwise."
+        for move in moves:
+            t = self.tt.look_up(play(pos, move))
+            if t and t.intensity >= intensity - 1 and (-t).window > window:
+                return beta_cut(-t, move)
+        return None
+
+    def evaluated(self, pos: Position) -> Result:
+        "Returns the result of evaluating a position with the evaluator."
+        score = self.evaluator.eval(pos)
+        return Result(ClosedInterval(score, score), Intensity(0), Field.PS)
+
+    def endgame_solve(self, pos: Position, window: OpenInterval) -> Result:
+        "Solves a position with the endgame solver."
+        result = self.endgame.solve(pos, window)
+        self.nodes += self.endgame.nodes
+        self.endgame.nodes = 0
+        return result
+
     def transposition_cut(
         self, pos: Position, window: OpenInterval, intensity: Intensity
     ) -> Result | None:
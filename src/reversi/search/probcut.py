@@ -0,0 +1,139 @@
+"Multi-ProbCut, a selective cutter for PrincipalVariation."
+from typing import Iterable
+import math
+import numpy as np
+from reversi.game import (
+    OpenInterval,
+    ClosedInterval,
+    Intensity,
+    Field,
+    Position,
+    ScoredPosition,
+    min_score,
+    max_score,
+    undefined_score,
+)
+from .move_sorters import sorted_by_mobility
+from .principal_variation import PrincipalVariation
+from .result import Result
+
+
+def shallow_depth(depth: int) -> int:
+    "Returns the depth of the search that predicts a search of the given depth."
+    # Keeps the parity of the depth, since evaluations of the same player correlate better.
+    return depth // 4 * 2 + depth % 2
+
+
+class MultiProbCut:
+    """
+    Cuts a node if a shallow search predicts the result of the deep search to be outside
+    the window, with a probability given by the intensity's confidence level.
+    The deep score v_D is modelled as a * v_d + b, with normally distributed error sigma.
+    Searches of infinite confidence level are never cut.
+    """
+
+    def __init__(
+        self,
+        evaluator,
+        parameters: dict[tuple[int, int], tuple[float, float, float]],
+        min_depth: int = 4,
+    ) -> None:
+        """
+        evaluator: Evaluates the leaves of the shallow searches.
+        parameters: Maps (empty count, depth) to the regression parameters (a, b, sigma).
+        min_depth: Shallower searches are not cut, since the shallow search would cost more.
+        """
+        self.parameters = parameters
+        self.min_depth = min_depth
+        self.search = PrincipalVariation(
+            sorted_by_mobility, endgame_empty_count=0, evaluator=evaluator
+        )
+
+    @property
+    def nodes(self) -> int:
+        "Returns the number of nodes of the shallow searches."
+        return self.search.nodes
+
+    def is_at_least(self, pos: Position, score: int, intensity: Intensity) -> bool:
+        "Returns whether the shallow search scores at least 'score'."
+        window = OpenInterval(score - 1, score)
+        return self.search.zws(pos, window, intensity).window > window
+
+    def is_at_most(self, pos: Position, score: int, intensity: Intensity) -> bool:
+        "Returns whether the shallow search scores at most 'score'."
+        window = OpenInterval(score, score + 1)
+        return self.search.zws(pos, window, intensity).window < window
+
+    def __call__(self, pos: Position, window: OpenInterval, intensity: Intensity) -> Result | None:
+        if intensity.is_exact() or intensity.depth < self.min_depth:
+            return None
+        depth = min(intensity.depth, pos.empty_count())
+        params = self.parameters.get((pos.empty_count(), depth))
+        if params is None:
+            return None
+        a, b, sigma = params
+        t = intensity.confidence_level
+        shallow = Intensity(shallow_depth(depth))
+        cut_intensity = Intensity(depth, t)
+
+        # v_D >= upper with confidence t, if v_d >= (upper + t * sigma - b) / a.
+        # The bounds are rounded away from the window, so the cuts keep the margin t * sigma.
+        if window.upper < max_score:
+            bound = max(math.ceil((window.upper + t * sigma - b) / a), min_score + 1)
+            if bound <= max_score and self.is_at_least(pos, bound, shallow):
+                return Result(ClosedInterval(window.upper, max_score), cut_intensity, Field.PS)
+
+        # v_D <= lower with confidence t, if v_d <= (lower - t * sigma - b) / a.
+        if window.lower > min_score:
+            bound = min(math.floor((window.lower - t * sigma - b) / a), max_score - 1)
+            if bound >= min_score and self.is_at_most(pos, bound, shallow):
+                return Result(ClosedInterval(min_score, window.lower), cut_intensity, Field.PS)
+        return None
+
+
+def fitted_probcut_parameters(
+    scored_positions: Iterable[ScoredPosition],
+    evaluator,
+    depths: Iterable[int] | None = None,
+    samples: int = 100,
+) -> dict[tuple[int, int], tuple[float, float, float]]:
+    """
+    Returns the regression parameters (a, b, sigma) per (empty count, depth), fitted on at
+    most 'samples' positions per empty count.
+    Without 'depths', only searches to the end of the game are fitted.
+    The deep score is the position's score if the depth reaches the end of the game,
+    and the result of a depth limited search otherwise.
+    """
+    depths = None if depths is None else list(depths)
+    search = PrincipalVariation(
+        sorted_by_mobility, endgame_empty_count=0, evaluator=evaluator
+    )
+    pairs: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    sample_count: dict[int, int] = {}
+    for scored_pos in scored_positions:
+        pos, score = scored_pos.pos, scored_pos.score
+        empty_count = pos.empty_count()
+        if score == undefined_score or sample_count.get(empty_count, 0) >= samples:
+            continue
+        sample_count[empty_count] = sample_count.get(empty_count, 0) + 1
+        for depth in [empty_count] if depths is None else depths:
+            if depth > empty_count:
+                continue
+            if depth < empty_count:
+                deep = search.eval(pos, intensity=Intensity(depth)).window.lower
+            else:
+                deep = score
+            shallow = search.eval(pos, intensity=Intensity(shallow_depth(depth))).window.lower
+            pairs.setdefault((empty_count, depth), []).append((shallow, deep))
+
+    parameters = {}
+    for key, values in pairs.items():
+        x, y = np.array(values, dtype=np.float64).T
+        if len(values) < 2 or np.all(x == x[0]):
+            continue
+        a, b = np.polyfit(x, y, 1)
+        if a <= 0:
+            continue
+        sigma = float(np.std(y - (a * x + b)))
+        parameters[key] = (float(a), float(b), sigma)
+    return parameters
@@ -10,21 +10,39 @@ from reversi.game import (
 
 
 class Result:
-    "Result of a search."
+    """
+    Result of a search.
+    'pv' is the principal variation, the expected line of play starting with the best move.
+    Searches fill it in at their root only, and it takes no part in comparisons.
+    """
 
     def __init__(
         self,
         window: ClosedInterval = ClosedInterval(min_score, max_score),
         intensity: Intensity = Intensity(-1, 0.0),
         best_move: Field = Field.PS,
+        pv: tuple[Field, ...] = (),
     ) -> None:
         self.window = window
         self.intensity = intensity
         self.best_move = best_move
+        self.pv = pv
 
     def __str__(self) -> str:
         return f"{self.window} d{self.intensity} {self.best_move.name}"
 
+    def __eq__(self, o) -> bool:
+        if not isinstance(o, Result):
+            return NotImplemented
+        return (
+            self.window == o.window
+            and self.intensity == o.intensity
+            and self.best_move == o.best_move
+        )
+
+    # Results are mutable, searches narrow their windows and fill in 'pv', so they aren't hashable.
+    __hash__ = None
+
     def __neg__(self) -> "Result":
         return Result(-self.window, self.intensity, self.best_move)
 
@@ -0,0 +1,96 @@
+"Hash table in shared memory, for searching with several processes."
+
+import struct
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from reversi.game import ClosedInterval, Field, Intensity, Position
+from .result import Result
+
+
+def packed(result: Result) -> tuple[int, int]:
+    "Returns the result packed into two 64 bit words."
+    data = (
+        (result.window.lower + 64)
+        | (result.window.upper + 64) << 8
+        | (result.intensity.depth + 1) << 16
+        | result.best_move.value << 24
+    )
+    confidence_level = struct.pack("<d", result.intensity.confidence_level)
+    return data, struct.unpack("<Q", confidence_level)[0]
+
+
+def unpacked(data: int, confidence_level: int) -> Result:
+    "Returns the result from two 64 bit words."
+    return Result(
+        ClosedInterval((data & 0xFF) - 64, (data >> 8 & 0xFF) - 64),
+        Intensity(
+            (data >> 16 & 0xFF) - 1,
+            struct.unpack("<d", struct.pack("<Q", confidence_level))[0],
+        ),
+        Field(data >> 24 & 0xFF),
+    )
+
+
+class SharedHashTable:
+    """
+    A hash table in shared memory, which several processes can use without locks.
+    Each entry stores the position xor-ed with its data, so a torn write of a concurrent
+    update fails verification and reads as a miss.
+    """
+
+    def __init__(self, size: int, name: str | None = None) -> None:
+        """
+        size: Number of entries.
+        name: Name of an existing shared memory block to attach to, or None to create one.
+        """
+        self.size = size
+        self.owner = name is None
+        self.memory = SharedMemory(name, create=self.owner, size=size * 4 * 8)
+        self.entries = np.ndarray((size, 4), dtype=np.uint64, buffer=self.memory.buf)
+        if self.owner:
+            self.clear()
+
+    def __getstate__(self):
+        return self.size, self.memory.name
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __index(self, pos: Position) -> int:
+        # Maps the 64 bit hash key to [0, size) using its well mixed high bits.
+        return (pos.hash_key * self.size) >> 64
+
+    def update(self, pos: Position, new_result: Result) -> bool:
+        "Update the hash table with a new result. Return whether the result was updated."
+        data, confidence_level = packed(new_result)
+        check = data ^ confidence_level
+        self.entries[self.__index(pos)] = (
+            int(pos.player) ^ check,
+            int(pos.opponent) ^ check,
+            data,
+            confidence_level,
+        )
+        return True
+
+    def look_up(self, pos: Position) -> Result | None:
+        "Return the result for a position or None."
+        player, opponent, data, confidence_level = self.entries[self.__index(pos)].tolist()
+        check = data ^ confidence_level
+        if player ^ check == pos.player and opponent ^ check == pos.opponent:
+            return unpacked(data, confidence_level)
+        return None
+
+    def new_generation(self) -> None:
+        "Start a new search."
+
+    def clear(self) -> None:
+        "Clear the hash table."
+        # Player and opponent can't both own every field, so this never verifies.
+        self.entries[:] = 0xFFFFFFFFFFFFFFFF
+
+    def close(self) -> None:
+        "Detach from the shared memory, and free it if this instance created it."
+        del self.entries
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
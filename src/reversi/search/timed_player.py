@@ -0,0 +1,111 @@
+"A player that spreads a game's clock over its moves."
+import copy
+import threading
+import time
+from typing import Iterable
+from reversi.game import Field, Position, Player, possible_moves, play
+from .endgame import EndgameSolver
+from .iterative_deepening import IterativeDeepening
+
+
+class TimeManager:
+    "Spreads the total time of a game evenly over the player's remaining moves."
+
+    def __init__(self, total_time: float) -> None:
+        self.total_time = total_time
+        self.remaining = total_time
+        self.last_empty_count = 61
+
+    def time_for(self, pos: Position) -> float:
+        "Returns the time to spend on a position. A position with more empties starts a new game."
+        empty_count = pos.empty_count()
+        if empty_count >= self.last_empty_count:
+            self.remaining = self.total_time
+        self.last_empty_count = empty_count
+        # The player makes every second move until the end of the game.
+        return self.remaining / max(1, (empty_count + 1) // 2)
+
+    def spend(self, seconds: float) -> None:
+        "Subtracts the time spent on a move."
+        self.remaining = max(0.0, self.remaining - seconds)
+
+
+class TimedPlayer(Player):
+    """
+    Chooses moves by iterative deepening, within a total time per game.
+    The hash table is kept between moves, with a new generation per move,
+    so the tree of the previous move orders and cuts the next one.
+    """
+
+    def __init__(
+        self, search: IterativeDeepening, total_time: float, ponder: bool = False
+    ) -> None:
+        """
+        search: Its 'max_time' is set for each move.
+                Its search needs an evaluator, so early iterations complete in time.
+        total_time: Seconds for all moves of the player in one game.
+                    In 'choose_moves', each index of the batch is a game with its own clock.
+        last_result: The search result of the last chosen move, with its principal variation.
+        ponder: Whether to search the position after the chosen move in a background thread,
+                until the next call of 'choose_move' or 'stop_pondering'.
+                The thread shares the hash table, but also the interpreter,
+                so it slows down an opponent that runs in the same process.
+        """
+        self.search = search
+        self.total_time = total_time
+        self.time_manager = TimeManager(total_time)
+        self.time_managers: list[TimeManager] = []
+        self.ponder = ponder
+        self.last_result = None
+        self.ponder_search = None
+        self.ponder_thread = None
+
+    def choose_move(self, pos: Position) -> Field:
+        return self.timed_move(pos, self.time_manager)
+
+    def choose_moves(self, pos: Iterable[Position]) -> list[Field]:
+        pos = list(pos)
+        while len(self.time_managers) < len(pos):
+            self.time_managers.append(TimeManager(self.total_time))
+        return [self.timed_move(p, tm) for p, tm in zip(pos, self.time_managers)]
+
+    def timed_move(self, pos: Position, time_manager: TimeManager) -> Field:
+        "Chooses a move within the time of the game's clock."
+        self.stop_pondering()
+        moves = possible_moves(pos)
+        if not moves:
+            return Field.PS
+        start = time.monotonic()
+        self.search.max_time = time_manager.time_for(pos)
+        self.search.search.tt.new_generation()
+        self.last_result = self.search.eval(pos)
+        move = self.last_result.best_move
+        time_manager.spend(time.monotonic() - start)
+        if move not in moves:  # aborted before any iteration completed
+            move = next(iter(moves))
+        if self.ponder:
+            self.start_pondering(play(pos, move))
+        return move
+
+    def start_pondering(self, pos: Position) -> None:
+        "Searches a position in a background thread, filling the hash table."
+        # A copy shares the hash table, move sorter and cutters, but counts and stops on its own.
+        search = copy.copy(self.search.search)
+        search.endgame = EndgameSolver()
+        self.ponder_search = search
+        deepening = copy.copy(self.search)
+        deepening.search = search
+        deepening.max_time = None
+        deepening.max_nodes = None
+        self.ponder_thread = threading.Thread(target=deepening.eval, args=(pos,), daemon=True)
+        self.ponder_thread.start()
+
+    def stop_pondering(self) -> None:
+        "Stops the background search, if there is one."
+        if self.ponder_thread is not None:
+            # The thread may not have started its budget yet, which clears the stop.
+            while self.ponder_thread.is_alive():
+                self.ponder_search.stop()
+                self.ponder_thread.join(0.01)
+            self.ponder_search = None
+            self.ponder_thread = None
@@ -1,6 +1,14 @@
 "Benchmarking the functions in reversi.py"
+import argparse
+import os
+import subprocess
+import sys
 import time
+from pathlib import Path
 from reversi import Position, Field, possible_moves, play, play_pass, end_score, perft
+from reversi import read_file, HashTable, PrincipalVariation, ParallelPrincipalVariation
+from reversi import sorted_fastest_first
+from reversi.board import flips
 
 
 def benchmark(name: str, fkt) -> None:
@@ -14,11 +22,69 @@ def benchmark(name: str, fkt) -> None:
         fkt(fforum_1)
     end = time.perf_counter()
     diff = (end - start) * 1_000
-    print(f"{name}: {diff:.1f} us")
+    calls_per_second = f"{1_000_000 / diff:_.0f}".replace("_", "'")
+    print(f"{name}: {diff:.1f} us ({calls_per_second} calls/s)")
+
+
+def benchmark_backends(depth: int) -> None:
+    "Benchmark perft(depth) with each bitboard backend, as it is chosen at import time."
+    code = (
+        "import time; from reversi import perft; "
+        f"start = time.perf_counter(); perft({depth}); print(time.perf_counter() - start)"
+    )
+    for backend in ["int", "numpy"]:
+        env = dict(os.environ, REVERSI_BACKEND=backend)
+        output = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, check=True, text=True
+        ).stdout
+        print(f"perft({depth}) with {backend} backend: {float(output):.1f} s")
+
+
+def benchmark_parallel(positions: list[Position], max_workers: int) -> None:
+    """
+    Benchmark exact solves with PrincipalVariation and with ParallelPrincipalVariation
+    for 1, 2, 4, ... and 'max_workers' workers.
+    Each position gets a new hash table of the same size.
+    """
+
+    def solve_all(new_search) -> tuple[int, float]:
+        nodes = 0
+        start = time.perf_counter()
+        for pos in positions:
+            search = new_search()
+            search.eval(pos)
+            nodes += search.nodes
+            if isinstance(search, ParallelPrincipalVariation):
+                search.close()
+        return nodes, time.perf_counter() - start
+
+    def serial() -> PrincipalVariation:
+        tt = HashTable(1_000_000)
+        return PrincipalVariation(sorted_fastest_first(tt), tt)
+
+    nodes, serial_time = solve_all(serial)
+    print(f"serial: {nodes:_} nodes, {serial_time:.1f} s".replace("_", "'"))
+    worker_counts = [1 << i for i in range(max_workers.bit_length()) if 1 << i < max_workers]
+    for workers in worker_counts + [max_workers]:
+        nodes, diff = solve_all(lambda: ParallelPrincipalVariation(workers, 1_000_000))
+        print(
+            f"{workers} workers: {nodes:_} nodes, {diff:.1f} s, "
+            f"speedup {serial_time / diff:.2f}".replace("_", "'")
+        )
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--positions", type=int, default=4, help="Number of fforum-20-39 positions to solve."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Most workers of the parallel solves."
+    )
+    args = parser.parse_args()
+
     benchmark("possible_moves", possible_moves)
+    benchmark("flips", lambda pos: flips(pos, Field.G8))
     benchmark("play", lambda pos: play(pos, Field.G8))
     benchmark("play_pass", play_pass)
     benchmark("end_score", end_score)
@@ -29,3 +95,8 @@ if __name__ == "__main__":
         end = time.perf_counter()
         diff = end - start
         print(f"perft({i}): {diff:.1f} s")
+
+    benchmark_backends(8)
+
+    fforum_20_39 = read_file(Path(__file__).parents[2] / "data" / "fforum-20-39.pos")
+    benchmark_parallel([x.pos for x in fforum_20_39[: args.positions]], args.workers)
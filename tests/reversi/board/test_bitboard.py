@@ -15,3 +15,10 @@ class BitBoardTest(unittest.TestCase):
 
     def test_flipped_vertical(self):
         self.assertEqual(flipped_vertical(uint64(0xF)), 0x0F00000000000000)
+
+    def test_python_int_stays_within_64_bits(self):
+        b = 0xFFFFFFFFFFFFFFFF
+        self.assertEqual(flipped_codiagonal(b), b)
+        self.assertEqual(flipped_diagonal(b), b)
+        self.assertEqual(flipped_horizontal(b), b)
+        self.assertEqual(flipped_vertical(b), b)
@@ -0,0 +1,20 @@
+import unittest
+from reversi.board import Field, MutableBoard, Position, bit, play, play_pass
+
+
+class MutableBoardTest(unittest.TestCase):
+    def test_play(self):
+        board = MutableBoard(Position.start())
+        board.play(bit(Field(19)))
+        self.assertEqual(board.position(), play(Position.start(), Field(19)))
+
+    def test_undo(self):
+        board = MutableBoard(Position.start())
+        flips = board.play(bit(Field(19)))
+        board.undo(bit(Field(19)), flips)
+        self.assertEqual(board.position(), Position.start())
+
+    def test_play_pass(self):
+        board = MutableBoard(Position.start())
+        board.play_pass()
+        self.assertEqual(board.position(), play_pass(Position.start()))
@@ -7,6 +7,26 @@ class PlayTest(unittest.TestCase):
         pos = play(Position.start(), Field(19))
         self.assertEqual(pos, Position(0x0000001000000000, 0x0000000818080000))
 
+    def test_flips_in_all_directions(self):
+        move = Field(27)
+        opponent = sum(1 << (27 + d) for d in (-9, -8, -7, -1, +1, +7, +8, +9))
+        player = sum(1 << (27 + 2 * d) for d in (-9, -8, -7, -1, +1, +7, +8, +9))
+        self.assertEqual(flips(Position(player, opponent), move), opponent)
+
+    def test_flips_stop_at_edge(self):
+        move = Field.A8
+        opponent = 1 << 8  # H7, the next bit but on the other side of the board
+        player = 1 << 9
+        self.assertEqual(flips(Position(player, opponent), move), 0)
+
+    def test_play_updates_hash_key(self):
+        pos = play(Position.start(), Field(19))
+        self.assertEqual(pos.hash_key, Position(pos.player, pos.opponent).hash_key)
+
+    def test_play_pass_updates_hash_key(self):
+        pos = play_pass(Position.start())
+        self.assertEqual(pos.hash_key, Position(pos.player, pos.opponent).hash_key)
+
     def test_play_pass(self):
         start = Position.start()
         passed = play_pass(start)
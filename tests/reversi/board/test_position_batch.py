@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+from reversi.board import (
+    Field,
+    Position,
+    PositionBatch,
+    children,
+    possible_moves,
+    play,
+    play_pass,
+    is_game_over,
+    end_score,
+    flipped_to_unique,
+    unique_positions,
+)
+
+positions = list(children(Position.start(), 5)) + [
+    Position(0, 0),
+    Position(0xFFFFFFFFFFFFFFFF, 0),
+    Position(0xFF, 0x1FF00),
+    Position(0x8000000000000001, 0x7FFFFFFFFFFFFFFE),
+]
+
+
+class PositionBatchTest(unittest.TestCase):
+    def test_from_positions_and_back(self):
+        batch = PositionBatch.from_positions(positions)
+        self.assertEqual(len(batch), len(positions))
+        self.assertEqual(list(batch), positions)
+        self.assertEqual(batch[3], positions[3])
+
+    def test_getitem_with_mask(self):
+        batch = PositionBatch.from_positions(positions)
+        filtered = batch[batch.empty_count() == 0]
+        self.assertEqual(list(filtered), [p for p in positions if p.empty_count() == 0])
+
+    def test_empty_count(self):
+        batch = PositionBatch.from_positions(positions)
+        self.assertEqual(batch.empty_count().tolist(), [p.empty_count() for p in positions])
+
+    def test_possible_moves(self):
+        batch = PositionBatch.from_positions(positions)
+        self.assertEqual(batch.possible_moves().tolist(), [possible_moves(p) for p in positions])
+
+    def test_play(self):
+        moves = [next(iter(possible_moves(p)), Field.PS) for p in positions]
+        batch = PositionBatch.from_positions(positions).play(moves)
+        self.assertEqual(list(batch), [play(p, m) for p, m in zip(positions, moves)])
+
+    def test_play_field_values(self):
+        moves = [next(iter(possible_moves(p)), Field.PS) for p in positions]
+        values = np.array([m.value for m in moves])
+        batch = PositionBatch.from_positions(positions)
+        self.assertEqual(batch.play(values), batch.play(moves))
+
+    def test_play_pass(self):
+        batch = PositionBatch.from_positions(positions).play_pass()
+        self.assertEqual(list(batch), [play_pass(p) for p in positions])
+
+    def test_is_game_over(self):
+        batch = PositionBatch.from_positions(positions)
+        self.assertEqual(batch.is_game_over().tolist(), [is_game_over(p) for p in positions])
+
+    def test_end_score(self):
+        batch = PositionBatch.from_positions(positions)
+        self.assertEqual(batch.end_score().tolist(), [end_score(p) for p in positions])
+
+    def test_flipped_to_unique(self):
+        batch = PositionBatch.from_positions(positions).flipped_to_unique()
+        self.assertEqual(list(batch), [flipped_to_unique(p) for p in positions])
+
+    def test_unique_positions(self):
+        batch = PositionBatch.from_positions(positions).unique_positions()
+        self.assertEqual(sorted(batch), sorted(unique_positions(positions)))
+
+    def test_unique_positions_with_hash_collisions(self):
+        # A constant hash makes all positions collide.
+        with patch("reversi.board.position_batch.mixed", lambda p, o: np.zeros_like(p)):
+            batch = PositionBatch.from_positions(positions).unique_positions()
+        self.assertEqual(sorted(batch), sorted(unique_positions(positions)))
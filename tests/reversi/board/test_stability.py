@@ -0,0 +1,56 @@
+import random
+import unittest
+from reversi.board import (
+    Field,
+    Position,
+    play,
+    play_pass,
+    possible_moves,
+    stable_discs,
+)
+
+
+def random_game(seed: int) -> list[Position]:
+    "Returns the positions of a random game, each from the first player's view."
+    rng = random.Random(seed)
+    pos = Position.start()
+    positions = [pos]
+    pass_count = 0
+    while pass_count < 2:
+        moves = list(possible_moves(pos))
+        if moves:
+            pos = play(pos, rng.choice(moves))
+            pass_count = 0
+        else:
+            pos = play_pass(pos)
+            pass_count += 1
+        positions.append(play_pass(pos) if len(positions) % 2 else pos)
+    return positions
+
+
+class StabilityTest(unittest.TestCase):
+    def test_start(self):
+        self.assertEqual(stable_discs(Position.start()), 0)
+
+    def test_corner(self):
+        pos = Position(1 << Field.A1.value, 1 << Field.B1.value)
+        self.assertEqual(stable_discs(pos), 1 << Field.A1.value)
+
+    def test_edge_anchored_by_corner(self):
+        player = (1 << Field.A1.value) | (1 << Field.B1.value) | (1 << Field.C1.value)
+        pos = Position(player, 1 << Field.D1.value)
+        self.assertEqual(stable_discs(pos), player)
+
+    def test_full_board(self):
+        pos = Position(0x00000000FFFFFFFF, 0xFFFFFFFF00000000)
+        self.assertEqual(stable_discs(pos), pos.player)
+
+    def test_stable_discs_are_never_flipped(self):
+        for seed in range(20):
+            positions = random_game(seed)
+            for i, pos in enumerate(positions):
+                player_stable = stable_discs(pos)
+                opponent_stable = stable_discs(play_pass(pos))
+                for later in positions[i:]:
+                    self.assertEqual(later.player & player_stable, player_stable)
+                    self.assertEqual(later.opponent & opponent_stable, opponent_stable)
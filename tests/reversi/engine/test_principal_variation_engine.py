@@ -0,0 +1,75 @@
+import unittest
+from pathlib import Path
+import numpy as np
+from reversi import (
+    PrincipalVariationEngine,
+    PatternEvaluator,
+    ClosedInterval,
+    OpenInterval,
+    Intensity,
+    Position,
+    Field,
+    possible_moves,
+    read_file,
+)
+from reversi.evaluation import weight_count
+
+endgame = read_file(Path(__file__).parents[3] / "data" / "endgame.pos")
+
+
+class PrincipalVariationEngineTest(unittest.TestCase):
+    def test_solve(self):
+        engine = PrincipalVariationEngine(workers=1)
+        for scored_pos in endgame:
+            result = engine.solve(scored_pos.pos)
+            self.assertEqual(result.window, ClosedInterval(scored_pos.score, scored_pos.score))
+
+    def test_solve_has_no_selective_iterations(self):
+        engine = PrincipalVariationEngine(workers=1)
+        pos = endgame[-1].pos
+        intensity = Intensity(pos.empty_count())
+        self.assertEqual(engine.search.intensities(pos, intensity), [intensity])
+
+    def test_solve_many_in_process(self):
+        engine = PrincipalVariationEngine(workers=1)
+        results = engine.solve_many(x.pos for x in endgame)
+        self.assertEqual([r.window.lower for r in results], [x.score for x in endgame])
+
+    def test_solve_many_in_worker_processes(self):
+        engine = PrincipalVariationEngine(workers=2, chunk_size=3)
+        try:
+            results = engine.solve_many(x.pos for x in endgame)
+            results_again = engine.solve_many(x.pos for x in endgame)
+        finally:
+            engine.close()
+        self.assertEqual([r.window.lower for r in results], [x.score for x in endgame])
+        self.assertEqual(results, results_again)
+
+    def test_window(self):
+        engine = PrincipalVariationEngine(window=OpenInterval(-1, +1), workers=1)
+        for scored_pos in endgame:
+            self.assertIn(scored_pos.score, engine.solve(scored_pos.pos).window)
+
+    def test_intensity(self):
+        weights = np.random.default_rng(0).normal(size=(4, weight_count)).astype(np.float32)
+        engine = PrincipalVariationEngine(
+            intensity=Intensity(3), evaluator=PatternEvaluator(weights), workers=1
+        )
+        result = engine.solve(Position.start())
+        self.assertEqual(result.intensity, Intensity(3))
+
+    def test_choose_move(self):
+        engine = PrincipalVariationEngine(workers=1)
+        pos = endgame[-1].pos
+        self.assertIn(engine.choose_move(pos), possible_moves(pos))
+
+    def test_pass(self):
+        pos = Position.from_string(
+            "-XXXXXXO-XXOOOOOOXOXXOXO-XOOOXXO-XOOOXXX-XOOOXX---XXOXXOXXXXXX-- X"
+        )
+        engine = PrincipalVariationEngine(workers=1)
+        self.assertEqual(engine.choose_move(pos), Field.PS)
+        moves = engine.choose_moves([pos, endgame[-1].pos, pos])
+        self.assertEqual(moves[0], Field.PS)
+        self.assertIn(moves[1], possible_moves(endgame[-1].pos))
+        self.assertEqual(moves[2], Field.PS)
@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+from reversi.game import Position, flipped_codiagonal, flipped_diagonal, flipped_horizontal
+from reversi.evaluation import (
+    batch_pattern_indices,
+    corner_2x5,
+    corner_3x3,
+    diagonal,
+    edge,
+    pattern_indices,
+    weight_count,
+)
+
+pos = Position.from_string(
+    "---------------------------OX------XO-------OOX-----O-X-------X- X"
+)
+
+
+class PatternTest(unittest.TestCase):
+    def test_edge(self):
+        self.assertEqual(edge(0xFF00000000000081), 0x81)
+
+    def test_corner_3x3(self):
+        self.assertEqual(corner_3x3(0x0000000000040201), 0b100_010_001)
+
+    def test_corner_2x5(self):
+        self.assertEqual(corner_2x5(0x0000000000001001), 0b10000_00001)
+
+    def test_diagonal(self):
+        pattern = diagonal(0x8040201008040201, 8)
+        self.assertEqual(pattern(0x8000000000000001), 0x81)
+        self.assertEqual(pattern(0x0000000000000002), 0)
+
+    def test_indices_are_in_range(self):
+        indices = pattern_indices(pos.player, pos.opponent)
+        self.assertTrue(all(0 <= i < weight_count for i in indices))
+
+    def test_indices_are_symmetric(self):
+        expected = sorted(pattern_indices(pos.player, pos.opponent))
+        for flipped in (flipped_codiagonal, flipped_diagonal, flipped_horizontal):
+            p = flipped(pos)
+            self.assertEqual(sorted(pattern_indices(p.player, p.opponent)), expected)
+
+    def test_batch_indices(self):
+        player = np.array([pos.player, 0], dtype=np.uint64)
+        opponent = np.array([pos.opponent, 0], dtype=np.uint64)
+        indices = batch_pattern_indices(player, opponent)
+        self.assertEqual(indices[0].tolist(), pattern_indices(pos.player, pos.opponent))
+        self.assertEqual(indices[1].tolist(), pattern_indices(0, 0))
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+from reversi.game import Position, PositionBatch
+from reversi.evaluation import (
+    PatternEvaluator,
+    bias_index,
+    read_weights,
+    weight_count,
+    write_weights,
+)
+
+
+class PatternEvaluatorTest(unittest.TestCase):
+    def test_bias(self):
+        weights = np.zeros((2, weight_count), dtype=np.float32)
+        weights[:, bias_index] = [3, 5]
+        evaluator = PatternEvaluator(weights)
+        self.assertEqual(evaluator.eval(Position.start()), 5)
+        self.assertEqual(evaluator.eval(Position(0xFFFFFFFF, 0xFFFFFFFF00000000)), 3)
+
+    def test_more_than_60_empties(self):
+        weights = np.zeros((2, weight_count), dtype=np.float32)
+        weights[:, bias_index] = [3, 5]
+        evaluator = PatternEvaluator(weights)
+        self.assertEqual(evaluator.eval(Position(0, 0)), 5)
+        self.assertEqual(evaluator.eval(Position(1, 0)), 5)
+        batch = PositionBatch.from_positions([Position(0, 0), Position(1, 2)])
+        self.assertEqual(evaluator.eval_batch(batch).tolist(), [5, 5])
+
+    def test_score_is_clamped(self):
+        weights = np.full((1, weight_count), 10, dtype=np.float32)
+        self.assertEqual(PatternEvaluator(weights).eval(Position.start()), 64)
+
+    def test_eval_batch(self):
+        weights = np.random.default_rng(0).normal(size=(3, weight_count)).astype(np.float32)
+        evaluator = PatternEvaluator(weights)
+        positions = [Position.start(), Position(0x0000000000FF0081, 0x0000001818000000)]
+        batch = PositionBatch.from_positions(positions)
+        expected = [evaluator.eval(pos) for pos in positions]
+        self.assertEqual(evaluator.eval_batch(batch).tolist(), expected)
+
+    def test_wrong_shape(self):
+        with self.assertRaises(ValueError):
+            PatternEvaluator(np.zeros((1, 10), dtype=np.float32))
+
+    def test_file(self):
+        weights = np.random.default_rng(0).normal(size=(3, weight_count)).astype(np.float32)
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory) / "weights"
+            write_weights(file_path, weights)
+            read = read_weights(file_path)
+        np.testing.assert_array_equal(read, weights.astype(np.float16))
+
+    def test_not_a_weights_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory) / "weights"
+            file_path.write_bytes(b"not a weights file")
+            with self.assertRaises(ValueError):
+                read_weights(file_path)
@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from itertools import islice
+from pathlib import Path
+import numpy as np
+from reversi.game import Game, Position, ScoredGame, undefined_score
+from reversi.evaluation import (
+    PatternEvaluator,
+    fitted_weights,
+    read_weights,
+    scored_games_of,
+    scored_position_batches,
+    train,
+    weight_count,
+)
+
+data = Path(__file__).parents[3] / "data"
+games_file = data / "Edax4.4_selfplay_level_5_from_e54.gs"
+
+
+class TrainingTest(unittest.TestCase):
+    def test_undefined_scores_are_skipped(self):
+        game = ScoredGame(Game(Position.start()), [undefined_score])
+        self.assertEqual(list(scored_position_batches([game, game])), [])
+
+    def test_batches(self):
+        games = list(islice(scored_games_of([games_file]), 10))
+        batches = list(scored_position_batches(games, batch_size=100))
+        sizes = [len(batch) for batch, _ in batches]
+        defined = sum(s != undefined_score for g in games for s in g.scores)
+        self.assertEqual(sum(sizes), defined)
+        self.assertTrue(all(size == 100 for size in sizes[:-1]))
+        for batch, scores in batches:
+            self.assertEqual(len(batch), len(scores))
+
+    def test_fit_reduces_error(self):
+        games = list(islice(scored_games_of([games_file]), 200))
+        weights = fitted_weights(games, stage_count=4, iterations=20, batch_size=1000)
+        self.assertEqual(weights.shape, (4, weight_count))
+
+        evaluator = PatternEvaluator(weights)
+        for batch, scores in scored_position_batches(games):
+            error = np.abs(evaluator.eval_batch(batch) - scores).mean()
+            self.assertLess(error, np.abs(scores).mean() / 2)
+
+    def test_train_writes_weights_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            weights_path = Path(directory) / "weights"
+            games_path = Path(directory) / "games.gs"
+            with open(games_file, encoding="utf-8") as file:
+                games_path.write_text("".join(islice(file, 20)), encoding="utf-8")
+            weights = train([games_path], weights_path, stage_count=2, iterations=5)
+            np.testing.assert_array_equal(read_weights(weights_path), weights.astype(np.float16))
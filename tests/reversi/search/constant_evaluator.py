@@ -0,0 +1,9 @@
+"An evaluator for tests, which scores every position the same."
+
+
+class ConstantEvaluator:
+    def __init__(self, score: int = 0) -> None:
+        self.score = score
+
+    def eval(self, _) -> int:
+        return self.score
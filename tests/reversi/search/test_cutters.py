@@ -0,0 +1,41 @@
+import unittest
+from pathlib import Path
+from parameterized import parameterized
+from reversi import (
+    PrincipalVariation,
+    ScoredPosition,
+    OpenInterval,
+    Intensity,
+    Position,
+    max_score,
+    read_file,
+    stability_cutter,
+)
+
+endgame = read_file(Path(__file__).parents[3] / "data" / "endgame.pos")
+
+
+class StabilityCutterTest(unittest.TestCase):
+    def test_no_cut_at_start(self):
+        pos = Position.start()
+        self.assertIsNone(stability_cutter(pos, OpenInterval(0, 2), Intensity(60)))
+
+    def test_fail_low(self):
+        pos = Position(0x00000000000000FF, 0xFFFFFFFFFFFFFF00)
+        result = stability_cutter(pos, OpenInterval(-48, 0), Intensity(0))
+        self.assertIsNotNone(result)
+        self.assertLessEqual(result.window.upper, -48)
+
+    @parameterized.expand(endgame)
+    def test_endgame(self, scored_pos: ScoredPosition):
+        pv = PrincipalVariation(cutters=[stability_cutter], endgame_empty_count=0)
+        result = pv.eval(scored_pos.pos)
+        self.assertTrue(result.is_exact())
+        self.assertEqual(result.window.lower, scored_pos.score)
+
+    @parameterized.expand(endgame)
+    def test_endgame_fail_low(self, scored_pos: ScoredPosition):
+        window = OpenInterval(scored_pos.score, max_score)
+        pv = PrincipalVariation(cutters=[stability_cutter], endgame_empty_count=0)
+        result = pv.eval(scored_pos.pos, window)
+        self.assertLessEqual(result.window.upper, scored_pos.score)
@@ -43,3 +43,86 @@ class TestHashTable(unittest.TestCase):
         result = ht.look_up(pos)
 
         self.assertEqual(result, None)
+
+    def test_from_megabytes(self):
+        ht = HashTable.from_megabytes(1)
+        self.assertEqual(len(ht.entries), 1024 * 1024 // (2 * ht.entries.itemsize))
+
+    def test_keeps_deeper_result_and_latest_result(self):
+        pos1 = Position.start()
+        pos2 = play(pos1, Field.D3)
+        pos3 = play(pos1, Field.C4)
+        deep = Result(ClosedInterval(-1, +1), Intensity(10), Field.A4)
+        shallow = Result(ClosedInterval(-2, +2), Intensity(2), Field.B5)
+
+        ht = HashTable(1)
+        ht.update(pos1, deep)
+        ht.update(pos2, shallow)
+        ht.update(pos3, shallow)
+
+        self.assertEqual(ht.look_up(pos1), deep)
+        self.assertEqual(ht.look_up(pos2), None)
+        self.assertEqual(ht.look_up(pos3), shallow)
+
+    def test_deeper_result_demotes_previous_one(self):
+        pos1 = Position.start()
+        pos2 = play(pos1, Field.D3)
+        shallow = Result(ClosedInterval(-2, +2), Intensity(2), Field.B5)
+        deep = Result(ClosedInterval(-1, +1), Intensity(10), Field.A4)
+
+        ht = HashTable(1)
+        ht.update(pos1, shallow)
+        ht.update(pos2, deep)
+
+        self.assertEqual(ht.look_up(pos1), shallow)
+        self.assertEqual(ht.look_up(pos2), deep)
+
+    def test_new_generation_replaces_old_deep_result(self):
+        pos1 = Position.start()
+        pos2 = play(pos1, Field.D3)
+        pos3 = play(pos1, Field.C4)
+        deep = Result(ClosedInterval(-1, +1), Intensity(10), Field.A4)
+        shallow = Result(ClosedInterval(-2, +2), Intensity(2), Field.B5)
+
+        ht = HashTable(1)
+        ht.update(pos1, deep)
+        ht.new_generation()
+        ht.update(pos2, shallow)
+        ht.update(pos3, shallow)
+
+        self.assertEqual(ht.look_up(pos1), None)
+        self.assertEqual(ht.look_up(pos2), shallow)
+        self.assertEqual(ht.look_up(pos3), shallow)
+
+    def test_symmetric_variants_share_an_entry(self):
+        pos = play(play(Position.start(), Field.D3), Field.C5)
+        result = Result(ClosedInterval(-1, +1), Intensity(3, 1.0), Field.F6)
+
+        ht = HashTable(5, symmetric_empty_count=50)
+        ht.update(pos, result)
+
+        for flipped in (flipped_codiagonal, flipped_diagonal, flipped_horizontal, flipped_vertical):
+            variant = flipped(pos)
+            t = ht.look_up(variant)
+            self.assertEqual(t.window, result.window)
+            self.assertEqual(t.intensity, result.intensity)
+            self.assertEqual(play(variant, t.best_move), flipped(play(pos, Field.F6)))
+
+    def test_symmetric_variants_are_distinct_below_symmetric_empty_count(self):
+        pos = play(play(Position.start(), Field.D3), Field.C5)
+        result = Result(ClosedInterval(-1, +1), Intensity(3, 1.0), Field.F6)
+
+        ht = HashTable(5, symmetric_empty_count=58)
+        ht.update(pos, result)
+
+        self.assertEqual(ht.look_up(pos), result)
+        self.assertEqual(ht.look_up(flipped_horizontal(pos)), None)
+
+    def test_search_with_symmetric_entries(self):
+        pos = Position.from_string(
+            "--XXXXX--OOOXX-O-OOOXXOX-OXOXOXXOXXXOXXX--XOXOXX-XXXOOO--OOOOO-- X"
+        )
+        tt = HashTable(1 << 16, symmetric_empty_count=0)
+        result = PrincipalVariation(sorted_by_mobility_and_tt(tt), tt).eval(pos)
+        self.assertEqual(result.window, ClosedInterval(18, 18))
+        self.assertEqual(result.best_move, Field.G8)
@@ -0,0 +1,33 @@
+import unittest
+from pathlib import Path
+from parameterized import parameterized
+from reversi import (
+    InPlacePrincipalVariation,
+    ScoredPosition,
+    OpenInterval,
+    min_score,
+    max_score,
+    read_file,
+)
+
+endgame = read_file(Path(__file__).parents[3] / "data" / "endgame.pos")
+
+
+class InPlacePrincipalVariationTest(unittest.TestCase):
+    @parameterized.expand(endgame)
+    def test_endgame(self, scored_pos: ScoredPosition):
+        result = InPlacePrincipalVariation().eval(scored_pos.pos)
+        self.assertTrue(result.is_exact())
+        self.assertEqual(result.window.lower, scored_pos.score)
+
+    @parameterized.expand(endgame)
+    def test_endgame_fail_low(self, scored_pos: ScoredPosition):
+        window = OpenInterval(scored_pos.score, max_score)
+        result = InPlacePrincipalVariation().eval(scored_pos.pos, window)
+        self.assertLessEqual(result.window.upper, scored_pos.score)
+
+    @parameterized.expand(endgame)
+    def test_endgame_fail_high(self, scored_pos: ScoredPosition):
+        window = OpenInterval(min_score, scored_pos.score)
+        result = InPlacePrincipalVariation().eval(scored_pos.pos, window)
+        self.assertGreaterEqual(result.window.lower, scored_pos.score)
@@ -0,0 +1,121 @@
+import unittest
+from pathlib import Path
+from parameterized import parameterized
+from reversi import (
+    IterativeDeepening,
+    PrincipalVariation,
+    HashTable,
+    ScoredPosition,
+    OpenInterval,
+    ClosedInterval,
+    Intensity,
+    Result,
+    Position,
+    Field,
+    min_score,
+    max_score,
+    read_file,
+    sorted_by_mobility,
+    sorted_by_mobility_and_tt,
+)
+from reversi.search import MultiProbCut, edax_confidence_levels
+from constant_evaluator import ConstantEvaluator
+
+endgame = read_file(Path(__file__).parents[3] / "data" / "endgame.pos")
+fforum = read_file(Path(__file__).parents[3] / "data" / "fforum-1-19.pos")
+
+
+class IterativeDeepeningTest(unittest.TestCase):
+    @parameterized.expand(endgame)
+    def test_endgame(self, scored_pos: ScoredPosition):
+        result = IterativeDeepening().eval(scored_pos.pos)
+        self.assertTrue(result.is_exact())
+        self.assertEqual(result.window.lower, scored_pos.score)
+
+    @parameterized.expand(endgame)
+    def test_endgame_fail_low(self, scored_pos: ScoredPosition):
+        window = OpenInterval(scored_pos.score, max_score)
+        result = IterativeDeepening().eval(scored_pos.pos, window)
+        self.assertLessEqual(result.window.upper, scored_pos.score)
+
+    @parameterized.expand(endgame)
+    def test_endgame_fail_high(self, scored_pos: ScoredPosition):
+        window = OpenInterval(min_score, scored_pos.score)
+        result = IterativeDeepening().eval(scored_pos.pos, window)
+        self.assertGreaterEqual(result.window.lower, scored_pos.score)
+
+    def test_fforum(self):
+        scored_pos = fforum[0]
+        result = IterativeDeepening().eval(scored_pos.pos)
+        self.assertEqual(result.window.lower, scored_pos.score)
+        self.assertEqual(result.intensity, Intensity(scored_pos.pos.empty_count()))
+
+    def test_intensities_without_evaluator(self):
+        pos = Position.start()
+        intensities = IterativeDeepening(confidence_levels=(1.1, 2.0)).intensities(
+            pos, Intensity(10, 2.0)
+        )
+        self.assertEqual(intensities, [Intensity(10, 1.1), Intensity(10, 2.0)])
+
+    def test_confidence_levels_need_a_selective_cutter(self):
+        self.assertEqual(IterativeDeepening().confidence_levels, ())
+        search = PrincipalVariation(cutters=[MultiProbCut(ConstantEvaluator(), {})])
+        self.assertEqual(IterativeDeepening(search).confidence_levels, edax_confidence_levels)
+
+    def test_no_more_nodes_than_without_deepening(self):
+        pos = fforum[0].pos
+        for new_search in (
+            lambda: PrincipalVariation(sorted_by_mobility),
+            lambda: PrincipalVariation(sorted_by_mobility_and_tt(tt), tt),
+        ):
+            tt = HashTable(1_000_000)
+            search = new_search()
+            search.eval(pos)
+            tt = HashTable(1_000_000)
+            deepening = IterativeDeepening(new_search())
+            deepening.eval(pos)
+            self.assertLessEqual(deepening.nodes, search.nodes)
+
+    def test_intensities_with_evaluator(self):
+        tt = HashTable(1_000)
+        search = PrincipalVariation(
+            sorted_by_mobility_and_tt(tt), tt, evaluator=ConstantEvaluator()
+        )
+        deepening = IterativeDeepening(search, confidence_levels=(1.1,))
+        pos = Position.start()
+        self.assertEqual(
+            deepening.intensities(pos, Intensity(4)),
+            [Intensity(1), Intensity(2), Intensity(3), Intensity(4, 1.1), Intensity(4)],
+        )
+        self.assertEqual(
+            deepening.intensities(pos, Intensity(60))[:2], [Intensity(1), Intensity(2)]
+        )
+        self.assertEqual(deepening.intensities(pos, Intensity(60))[-3], Intensity(49))
+
+    @parameterized.expand(endgame)
+    def test_aspiration_search_widens(self, scored_pos: ScoredPosition):
+        deepening = IterativeDeepening(aspiration_width=1)
+        window = OpenInterval(min_score, max_score)
+        for guess in (-10, +10):
+            score = max(min(scored_pos.score + guess, max_score), min_score)
+            result = deepening.aspiration_search(
+                scored_pos.pos,
+                window,
+                Intensity(scored_pos.pos.empty_count()),
+                Result(ClosedInterval(score, score)),
+            )
+            self.assertTrue(result.is_exact())
+            self.assertEqual(result.window.lower, scored_pos.score)
+
+    def test_max_nodes_returns_last_completed_iteration(self):
+        tt = HashTable(1_000)
+        search = PrincipalVariation(
+            sorted_by_mobility_and_tt(tt), tt, evaluator=ConstantEvaluator()
+        )
+        deepening = IterativeDeepening(search, max_nodes=1_000)
+        result = deepening.eval(Position.start())
+        self.assertTrue(search.aborted)
+        self.assertGreater(result.intensity.depth, 0)
+        self.assertLess(result.intensity.depth, 60)
+        self.assertTrue(result.is_exact())
+        self.assertNotEqual(result.best_move, Field.PS)
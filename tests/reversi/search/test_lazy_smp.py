@@ -0,0 +1,22 @@
+import unittest
+from pathlib import Path
+from parameterized import parameterized
+from reversi import LazySMP, ScoredPosition, read_file
+
+endgame = read_file(Path(__file__).parents[3] / "data" / "endgame.pos")
+
+
+class LazySMPTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.search = LazySMP(workers=2, hash_table_size=10_000)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.search.close()
+
+    @parameterized.expand(endgame[-4:])
+    def test_endgame(self, scored_pos: ScoredPosition):
+        result = self.search.eval(scored_pos.pos)
+        self.assertTrue(result.is_exact())
+        self.assertEqual(result.window.lower, scored_pos.score)
@@ -9,6 +9,9 @@ from reversi.search import (
     HashTable,
     sorted_by_mobility,
     sorted_by_mobility_and_tt,
+    HistorySorter,
+    sorted_fastest_first,
+    OrderingWeights,
 )
 
 
@@ -30,3 +33,93 @@ class MoveSorterTest(unittest.TestCase):
         self.assertEqual(moves[0], Field.E6)  # Best move
         self.assertEqual(moves[1], Field.C4)  # Lowest opponent mobility
         self.assertEqual(moves[-1], Field.B3)  # Highest opponent mobility
+
+    def test_history_sorter_near_root_sorts_by_mobility(self):
+        pos = Position(0x0000100810000000, 0x0000201008000000)
+        sorter = HistorySorter()
+        sorter.new_search(pos, Intensity(10))
+
+        moves = sorter(pos, possible_moves(pos))
+
+        self.assertEqual(moves[0], Field.C4)  # Lowest opponent mobility
+        self.assertEqual(moves[-1], Field.B3)  # Highest opponent mobility
+
+    def test_history_sorter_sorts_by_killers_and_history(self):
+        pos = Position(0x0000100810000000, 0x0000201008000000)
+        sorter = HistorySorter()
+        sorter.new_search(pos, Intensity(1))
+        sorter.beta_cut(pos, Field.B3, 1)
+        sorter.beta_cut(pos, Field.B3, 1)
+        sorter.beta_cut(pos, Field.E6, 2)
+        sorter.beta_cut(pos, Field.C4, 1)
+
+        moves = sorter(pos, possible_moves(pos))
+
+        self.assertEqual(moves[:3], [Field.C4, Field.E6, Field.B3])  # Killers, then history
+
+    def test_history_sorter_counts_depth_to_the_endgame_solver(self):
+        pos = Position(0x0000100810000000, 0x0000201008000000)
+        sorter = HistorySorter(solve_history_depth=2)
+        sorter.new_search(pos, Intensity(pos.empty_count()), leaf_empty_count=57)
+        sorter.beta_cut(pos, Field.B3, 1)
+
+        moves = sorter(pos, possible_moves(pos))
+
+        self.assertEqual(moves[0], Field.B3)  # Killer, not lowest opponent mobility
+
+    def test_history_sorter_sorts_solves_by_mobility(self):
+        pos = Position(0x0000100810000000, 0x0000201008000000)
+        sorter = HistorySorter()
+        sorter.new_search(pos, Intensity(pos.empty_count()), leaf_empty_count=57)
+        sorter.beta_cut(pos, Field.B3, 1)
+
+        moves = sorter(pos, possible_moves(pos))
+
+        self.assertEqual(moves[0], Field.C4)  # Lowest opponent mobility
+        self.assertEqual(moves[-1], Field.B3)  # Highest opponent mobility
+
+    def test_history_sorter_sorts_tt_move_first(self):
+        pos = Position(0x0000100810000000, 0x0000201008000000)
+        tt = HashTable(1)
+        tt.update(pos, Result(ClosedInterval(-1, +1), Intensity(3, 1.0), Field.E6))
+        sorter = HistorySorter(tt)
+        sorter.new_search(pos, Intensity(1))
+        sorter.beta_cut(pos, Field.C4, 1)
+
+        moves = sorter(pos, possible_moves(pos))
+
+        self.assertEqual(moves[:2], [Field.E6, Field.C4])
+
+    def test_sorted_fastest_first_by_mobility(self):
+        pos = Position(0x0000100810000000, 0x0000201008000000)
+        weights = OrderingWeights(1, 0, 0, 0, 0)
+        moves = sorted_fastest_first(stage_weights=[weights])(pos, possible_moves(pos))
+        self.assertEqual(moves, sorted_by_mobility(pos, possible_moves(pos)))
+
+    def test_sorted_fastest_first_prefers_corners(self):
+        pos = Position.from_string(
+            "---------OO------OX--------OX------XO--------------------------- X"
+        )
+        weights = OrderingWeights(0, 0, -8, 8, 0)
+        moves = sorted_fastest_first(stage_weights=[weights])(pos, possible_moves(pos))
+        self.assertEqual(moves[0], Field.A1)
+
+    def test_sorted_fastest_first_sorts_tt_move_first(self):
+        pos = Position(0x0000100810000000, 0x0000201008000000)
+        tt = HashTable(1)
+        tt.update(pos, Result(ClosedInterval(-1, +1), Intensity(3, 1.0), Field.B3))
+        moves = sorted_fastest_first(tt)(pos, possible_moves(pos))
+        self.assertEqual(moves[0], Field.B3)
+        self.assertEqual(set(moves), set(possible_moves(pos)))
+
+    def test_more_than_60_empties(self):
+        pos = Position(1 << 27, 1 << 28)
+        moves = possible_moves(pos)
+        weights = [OrderingWeights(), OrderingWeights(1, 0, 0, 0, 0)]
+        self.assertEqual(
+            sorted_fastest_first(stage_weights=weights)(pos, moves), [Field.C5]
+        )
+        sorter = HistorySorter()
+        sorter.new_search(pos, Intensity(1))
+        sorter.beta_cut(pos, Field.C5, 1)
+        self.assertEqual(sorter(pos, moves), [Field.C5])
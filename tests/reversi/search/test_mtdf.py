@@ -0,0 +1,80 @@
+import unittest
+from pathlib import Path
+import numpy as np
+from parameterized import parameterized
+from reversi import (
+    MTDf,
+    IterativeDeepening,
+    PrincipalVariation,
+    HashTable,
+    ScoredPosition,
+    OpenInterval,
+    ClosedInterval,
+    Intensity,
+    Position,
+    Field,
+    Result,
+    min_score,
+    max_score,
+    read_file,
+    sorted_fastest_first,
+    play,
+)
+from reversi.evaluation import PatternEvaluator, weight_count
+
+endgame = read_file(Path(__file__).parents[3] / "data" / "endgame.pos")
+fforum = read_file(Path(__file__).parents[3] / "data" / "fforum-1-19.pos")
+
+
+class MTDfTest(unittest.TestCase):
+    @parameterized.expand(endgame)
+    def test_endgame(self, scored_pos: ScoredPosition):
+        for guess in (-64, -10, 0, 10, 64):
+            result = MTDf().eval(scored_pos.pos, guess=guess)
+            self.assertEqual(result.window, ClosedInterval(scored_pos.score, scored_pos.score))
+
+    @parameterized.expand(endgame)
+    def test_endgame_fail_low(self, scored_pos: ScoredPosition):
+        window = OpenInterval(scored_pos.score, max_score)
+        result = MTDf().eval(scored_pos.pos, window)
+        self.assertLessEqual(result.window.upper, scored_pos.score)
+
+    @parameterized.expand(endgame)
+    def test_endgame_fail_high(self, scored_pos: ScoredPosition):
+        window = OpenInterval(min_score, scored_pos.score)
+        result = MTDf().eval(scored_pos.pos, window)
+        self.assertGreaterEqual(result.window.lower, scored_pos.score)
+
+    def test_fforum(self):
+        scored_pos = fforum[0]
+        result = MTDf().eval(scored_pos.pos)
+        self.assertEqual(result.window, ClosedInterval(scored_pos.score, scored_pos.score))
+        self.assertEqual(result.pv[0], result.best_move)
+
+    def test_first_guess_by_shallow_search(self):
+        weights = np.random.default_rng(0).normal(size=(4, weight_count)).astype(np.float32)
+        evaluator = PatternEvaluator(weights)
+        pos = play(Position.start(), Field.F5)
+        tt = HashTable(1_000)
+        search = PrincipalVariation(sorted_fastest_first(tt), tt, evaluator=evaluator)
+        mtdf = MTDf(search, guess_depth=3)
+        expected = PrincipalVariation(evaluator=evaluator).eval(pos, intensity=Intensity(3))
+        self.assertTrue(expected.is_exact())
+        self.assertNotEqual(expected.window.lower, 0)
+        self.assertEqual(mtdf.first_guess(pos, Intensity(10)), expected.window.lower)
+
+    def test_no_first_guess_without_evaluator(self):
+        self.assertEqual(MTDf().first_guess(Position.start(), Intensity(10)), 0)
+
+    def test_max_nodes_aborts(self):
+        tt = HashTable(1_000)
+        search = PrincipalVariation(sorted_fastest_first(tt), tt, max_nodes=100)
+        result = MTDf(search).eval(Position.start())
+        self.assertTrue(search.aborted)
+        self.assertEqual(result, Result())
+
+    def test_iterative_deepening(self):
+        scored_pos = fforum[0]
+        result = IterativeDeepening(mtdf=True).eval(scored_pos.pos)
+        self.assertEqual(result.window, ClosedInterval(scored_pos.score, scored_pos.score))
+        self.assertEqual(result.intensity, Intensity(scored_pos.pos.empty_count()))
@@ -0,0 +1,57 @@
+import unittest
+from pathlib import Path
+from parameterized import parameterized
+from reversi import (
+    ParallelPrincipalVariation,
+    PrincipalVariation,
+    ScoredPosition,
+    OpenInterval,
+    children,
+    read_file,
+)
+
+data = Path(__file__).parents[3] / "data"
+endgame = read_file(data / "endgame.pos")
+# Positions with 10 empties, which are deep enough to be split.
+midgame = list(children(read_file(data / "fforum-1-19.pos")[0].pos, 4))[:8:2]
+
+
+class ParallelPrincipalVariationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.search = ParallelPrincipalVariation(
+            workers=2, hash_table_size=10_000, split_depth=2, min_split_depth=7
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.search.close()
+
+    @parameterized.expand(endgame[-4:])
+    def test_endgame(self, scored_pos: ScoredPosition):
+        result = self.search.eval(scored_pos.pos)
+        self.assertTrue(result.is_exact())
+        self.assertEqual(result.window.lower, scored_pos.score)
+
+    @parameterized.expand(midgame)
+    def test_split_matches_serial_search(self, pos):
+        expected = PrincipalVariation().eval(pos)
+        result = self.search.eval(pos)
+        self.assertTrue(result.is_exact())
+        self.assertEqual(result.window, expected.window)
+        self.assertEqual(result.pv[0], result.best_move)
+
+    @parameterized.expand(midgame)
+    def test_zero_window(self, pos):
+        score = PrincipalVariation().eval(pos).window.lower
+        result = self.search.eval(pos, OpenInterval(score - 1, score))
+        self.assertTrue(result.window.lower >= score)
+
+    def test_counts_nodes_of_workers(self):
+        parallel = ParallelPrincipalVariation(workers=2, hash_table_size=10_000, min_split_depth=7)
+        try:
+            parallel.eval(midgame[0])
+        finally:
+            parallel.close()
+        self.assertGreater(parallel.worker_nodes, 0)
+        self.assertGreater(parallel.nodes, parallel.worker_nodes)
@@ -1,17 +1,31 @@
 import unittest
 from pathlib import Path
+import numpy as np
 from parameterized import parameterized
 from reversi import (
     PrincipalVariation,
     ScoredPosition,
     OpenInterval,
+    ClosedInterval,
     min_score,
     max_score,
     read_file,
     HashTable,
+    HistorySorter,
+    sorted_fastest_first,
+    Intensity,
+    Position,
+    Field,
+    play,
+    possible_moves,
+    is_game_over,
+    end_score,
+    Result,
 )
+from reversi.evaluation import PatternEvaluator, weight_count
 
 endgame = read_file(Path(__file__).parents[3] / "data" / "endgame.pos")
+several_moves = [x for x in endgame if len(possible_moves(x.pos)) >= 3]
 
 
 class PrincipalVariationTest(unittest.TestCase):
@@ -39,3 +53,196 @@ class PrincipalVariationTest(unittest.TestCase):
         result = PrincipalVariation(transposition_table=tt).eval(scored_pos.pos)
         self.assertTrue(result.is_exact())
         self.assertEqual(result.window.lower, scored_pos.score)
+
+    @parameterized.expand(endgame)
+    def test_endgame_with_enhanced_transposition_cut(self, scored_pos: ScoredPosition):
+        tt = HashTable(1_000_000)
+        pv = PrincipalVariation(
+            transposition_table=tt,
+            endgame_empty_count=0,
+            enhanced_transposition_cut=True,
+        )
+        result = pv.eval(scored_pos.pos)
+        self.assertTrue(result.is_exact())
+        self.assertEqual(result.window.lower, scored_pos.score)
+
+    def test_enhanced_transposition_cut_without_search(self):
+        pos = Position.start()
+        move = Field.F5
+        tt = HashTable(1_000)
+        tt.update(play(pos, move), Result(ClosedInterval(min_score, -10), Intensity(5), Field.PS))
+        pv = PrincipalVariation(transposition_table=tt, enhanced_transposition_cut=True)
+        result = pv.eval(pos, OpenInterval(0, 5), Intensity(6))
+        self.assertEqual(result.window, ClosedInterval(10, max_score))
+        self.assertEqual(result.best_move, move)
+        self.assertEqual(pv.nodes, 1)
+
+    @parameterized.expand(endgame)
+    def test_endgame_with_history_sorter(self, scored_pos: ScoredPosition):
+        tt = HashTable(1_000_000)
+        sorter = HistorySorter(tt, solve_history_depth=64)
+        pv = PrincipalVariation(sorter, tt, endgame_empty_count=0)
+        result = pv.eval(scored_pos.pos)
+        self.assertTrue(result.is_exact())
+        self.assertEqual(result.window.lower, scored_pos.score)
+
+    @parameterized.expand(endgame)
+    def test_solve_wld(self, scored_pos: ScoredPosition):
+        result = PrincipalVariation().solve_wld(scored_pos.pos)
+        self.assertIn(scored_pos.score, result.window)
+        if scored_pos.score > 0:
+            self.assertGreater(result.window.lower, 0)
+        elif scored_pos.score < 0:
+            self.assertLess(result.window.upper, 0)
+        else:
+            self.assertTrue(result.is_exact())
+
+    def test_analyze_pass(self):
+        pos = Position.from_string(
+            "-XXXXXXO-XXOOOOOOXOXXOXO-XOOOXXO-XOOOXXX-XOOOXX---XXOXXOXXXXXX-- X"
+        )
+        results = PrincipalVariation().analyze(pos)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].best_move, Field.PS)
+        self.assertEqual(results[0].pv[0], Field.PS)
+        self.assertEqual(results[0].window, -PrincipalVariation().eval(pos.passed()).window)
+
+    def test_analyze_game_over(self):
+        self.assertEqual(PrincipalVariation().analyze(Position(0, 0)), [])
+
+    def test_solve_wld_many(self):
+        tt = HashTable(1_000_000)
+        results = PrincipalVariation(transposition_table=tt).solve_wld_many(
+            scored_pos.pos for scored_pos in endgame
+        )
+        for result, scored_pos in zip(results, endgame):
+            self.assertIn(scored_pos.score, result.window)
+
+    @parameterized.expand(several_moves)
+    def test_analyze(self, scored_pos: ScoredPosition):
+        tt = HashTable(1_000_000)
+        results = PrincipalVariation(sorted_fastest_first(tt), tt).analyze(scored_pos.pos)
+        self.assertEqual(
+            {r.best_move for r in results}, set(possible_moves(scored_pos.pos))
+        )
+        self.assertEqual(results[0].window.lower, scored_pos.score)
+        for result in results:
+            self.assertTrue(result.is_exact())
+            child = PrincipalVariation().eval(play(scored_pos.pos, result.best_move))
+            self.assertEqual(result.window.lower, -child.window.lower)
+
+    @parameterized.expand(several_moves)
+    def test_analyze_top_k(self, scored_pos: ScoredPosition):
+        tt = HashTable(1_000_000)
+        pv = PrincipalVariation(sorted_fastest_first(tt), tt)
+        exact = {r.best_move: r.window.lower for r in pv.analyze(scored_pos.pos)}
+        tt.clear()
+        results = pv.analyze(scored_pos.pos, top_k=2)
+        self.assertEqual(results[0].window.lower, scored_pos.score)
+        second_best = sorted(exact.values(), reverse=True)[1]
+        for result in results[:2]:
+            self.assertTrue(result.is_exact())
+            self.assertEqual(result.window.lower, exact[result.best_move])
+        for result in results[2:]:
+            self.assertIn(exact[result.best_move], result.window)
+            self.assertLessEqual(result.window.upper, second_best)
+
+    @parameterized.expand(endgame)
+    def test_pv_leads_to_score(self, scored_pos: ScoredPosition):
+        for endgame_empty_count in (0, 6):
+            tt = HashTable(1_000)
+            pv = PrincipalVariation(
+                transposition_table=tt, endgame_empty_count=endgame_empty_count
+            )
+            result = pv.eval(scored_pos.pos)
+            pos = scored_pos.pos
+            for move in result.pv:
+                pos = play(pos, move)
+            self.assertTrue(is_game_over(pos))
+            self.assertEqual(end_score(pos) * (-1) ** len(result.pv), scored_pos.score)
+
+
+class DepthLimitedPrincipalVariationTest(unittest.TestCase):
+    def test_depth_1_is_best_child_evaluation(self):
+        weights = np.random.default_rng(0).normal(size=(4, weight_count)).astype(np.float32)
+        evaluator = PatternEvaluator(weights)
+        pos = Position.start()
+        pv = PrincipalVariation(evaluator=evaluator)
+        result = pv.eval(pos, intensity=Intensity(1))
+        expected = max(-evaluator.eval(play(pos, move)) for move in possible_moves(pos))
+        self.assertTrue(result.is_exact())
+        self.assertEqual(result.window.lower, expected)
+        self.assertEqual(result.intensity, Intensity(1))
+
+    def test_depth_3_matches_negamax_of_evaluations(self):
+        weights = np.random.default_rng(1).normal(size=(4, weight_count)).astype(np.float32)
+        evaluator = PatternEvaluator(weights)
+
+        def negamax(pos: Position, depth: int) -> int:
+            if depth == 0:
+                return evaluator.eval(pos)
+            return max(-negamax(play(pos, move), depth - 1) for move in possible_moves(pos))
+
+        pos = Position.start()
+        result = PrincipalVariation(evaluator=evaluator).eval(pos, intensity=Intensity(3))
+        self.assertEqual(result.window.lower, negamax(pos, 3))
+
+    def test_analyze_scores_every_move(self):
+        weights = np.random.default_rng(2).normal(size=(4, weight_count)).astype(np.float32)
+        evaluator = PatternEvaluator(weights)
+        pos = play(Position.start(), Field.F5)
+        results = PrincipalVariation(evaluator=evaluator).analyze(pos, Intensity(3))
+        self.assertEqual(len(results), len(possible_moves(pos)))
+        for result in results:
+            child = PrincipalVariation(evaluator=evaluator).eval(
+                play(pos, result.best_move), intensity=Intensity(2)
+            )
+            self.assertEqual(result.window, -child.window)
+            self.assertEqual(result.intensity, Intensity(3))
+
+    def test_pv_has_depth_of_search(self):
+        weights = np.random.default_rng(3).normal(size=(4, weight_count)).astype(np.float32)
+        tt = HashTable(10_000)
+        pv = PrincipalVariation(transposition_table=tt, evaluator=PatternEvaluator(weights))
+        result = pv.eval(Position.start(), intensity=Intensity(4))
+        self.assertEqual(len(result.pv), 4)
+        self.assertEqual(result.pv[0], result.best_move)
+
+    def test_budgeted_eval_has_no_pv(self):
+        weights = np.random.default_rng(3).normal(size=(4, weight_count)).astype(np.float32)
+        tt = HashTable(10_000)
+        pv = PrincipalVariation(transposition_table=tt, evaluator=PatternEvaluator(weights))
+        pv.start_budget(None, None)
+        result = pv.budgeted_eval(Position.start(), intensity=Intensity(4))
+        self.assertEqual(result.pv, ())
+        self.assertEqual(pv.principal_variation(Position.start(), result)[0], result.best_move)
+
+
+class BudgetedPrincipalVariationTest(unittest.TestCase):
+    def test_max_nodes_aborts(self):
+        pos = Position.start()
+        pv = PrincipalVariation(max_nodes=100)
+        result = pv.eval(pos)
+        self.assertTrue(pv.aborted)
+        self.assertLess(pv.nodes, 1_000)  # overshoots by at most one endgame solve
+        self.assertEqual(result, Result())
+
+    def test_max_time_aborts(self):
+        pv = PrincipalVariation(max_time=0.0)
+        pv.eval(Position.start())
+        self.assertTrue(pv.aborted)
+
+    def test_stop_ends_with_the_budget(self):
+        scored_pos = endgame[-1]
+        pv = PrincipalVariation(endgame_empty_count=0)
+        pv.stop()
+        result = pv.eval(scored_pos.pos)
+        self.assertFalse(pv.aborted)
+        self.assertEqual(result.window.lower, scored_pos.score)
+
+    def test_budget_suffices(self):
+        scored_pos = endgame[0]
+        pv = PrincipalVariation(max_nodes=1_000_000, max_time=100)
+        result = pv.eval(scored_pos.pos)
+        self.assertFalse(pv.aborted)
+        self.assertEqual(result.window.lower, scored_pos.score)
@@ -0,0 +1,90 @@
+import unittest
+from pathlib import Path
+from reversi import (
+    PrincipalVariation,
+    OpenInterval,
+    ClosedInterval,
+    Intensity,
+    read_file,
+    min_score,
+    max_score,
+)
+from reversi.search import MultiProbCut, fitted_probcut_parameters, shallow_depth
+from constant_evaluator import ConstantEvaluator
+
+endgame = read_file(Path(__file__).parents[3] / "data" / "endgame.pos")
+fforum = read_file(Path(__file__).parents[3] / "data" / "fforum-1-19.pos")
+
+
+class MultiProbCutTest(unittest.TestCase):
+    def test_shallow_depth_keeps_parity(self):
+        for depth in range(20):
+            self.assertEqual(shallow_depth(depth) % 2, depth % 2)
+            self.assertLessEqual(shallow_depth(depth), depth // 2 + 1)
+
+    def test_exact_intensity_is_never_cut(self):
+        pos = fforum[0].pos
+        cutter = MultiProbCut(ConstantEvaluator(0), {(pos.empty_count(), 14): (1, 0, 0)})
+        self.assertIsNone(cutter(pos, OpenInterval(-10, 10), Intensity(14)))
+
+    def test_missing_parameters_are_never_cut(self):
+        pos = fforum[0].pos
+        cutter = MultiProbCut(ConstantEvaluator(0), {})
+        self.assertIsNone(cutter(pos, OpenInterval(-10, 10), Intensity(14, 1.0)))
+
+    def test_fail_high(self):
+        pos = fforum[0].pos
+        parameters = {(pos.empty_count(), pos.empty_count()): (1, 0, 2)}
+        cutter = MultiProbCut(ConstantEvaluator(20), parameters)
+        result = cutter(pos, OpenInterval(-10, 10), Intensity(pos.empty_count(), 2.0))
+        self.assertEqual(result.window, ClosedInterval(10, max_score))
+        self.assertEqual(result.intensity, Intensity(pos.empty_count(), 2.0))
+
+    def test_fail_low(self):
+        pos = fforum[0].pos
+        parameters = {(pos.empty_count(), pos.empty_count()): (1, 0, 2)}
+        cutter = MultiProbCut(ConstantEvaluator(-20), parameters)
+        result = cutter(pos, OpenInterval(-10, 10), Intensity(pos.empty_count(), 2.0))
+        self.assertEqual(result.window, ClosedInterval(min_score, -10))
+
+    def test_no_cut_within_confidence(self):
+        pos = fforum[0].pos
+        parameters = {(pos.empty_count(), pos.empty_count()): (1, 0, 2)}
+        cutter = MultiProbCut(ConstantEvaluator(12), parameters)
+        self.assertIsNone(cutter(pos, OpenInterval(-10, 10), Intensity(pos.empty_count(), 2.0)))
+
+    def test_bounds_keep_the_margin(self):
+        pos = fforum[0].pos
+        empty_count = pos.empty_count()
+        intensity = Intensity(empty_count, 2.0)
+        # The shallow search has to score 10.4 or more to cut above 10, -10.4 or less below -10.
+        parameters = {(empty_count, empty_count): (1, -0.4, 0)}
+        cutter = MultiProbCut(ConstantEvaluator(10), parameters)
+        self.assertIsNone(cutter(pos, OpenInterval(-10, 10), intensity))
+        parameters = {(empty_count, empty_count): (1, 0.4, 0)}
+        cutter = MultiProbCut(ConstantEvaluator(-10), parameters)
+        self.assertIsNone(cutter(pos, OpenInterval(-10, 10), intensity))
+
+    def test_selective_search(self):
+        pos = fforum[0].pos
+        parameters = {(e, e): (1, 0, 2) for e in range(7, 20)}
+        cutter = MultiProbCut(ConstantEvaluator(0), parameters)
+        pv = PrincipalVariation(cutters=[cutter])
+        result = pv.eval(pos, intensity=Intensity(pos.empty_count(), 1.0))
+        self.assertEqual(result.intensity.confidence_level, 1.0)
+
+
+class FittedProbCutParametersTest(unittest.TestCase):
+    def test_exact_depths(self):
+        parameters = fitted_probcut_parameters(endgame, ConstantEvaluator(0))
+        self.assertTrue(parameters)
+        for (empty_count, depth), (a, _, sigma) in parameters.items():
+            self.assertEqual(empty_count, depth)
+            self.assertGreater(a, 0)
+            self.assertGreaterEqual(sigma, 0)
+
+    def test_depths(self):
+        parameters = fitted_probcut_parameters(endgame, ConstantEvaluator(0), depths=[2])
+        for empty_count, depth in parameters:
+            self.assertEqual(depth, 2)
+            self.assertGreaterEqual(empty_count, 2)
@@ -0,0 +1,61 @@
+import pickle
+import unittest
+from reversi.search import (
+    ClosedInterval,
+    Field,
+    Intensity,
+    Position,
+    Result,
+    SharedHashTable,
+)
+
+
+class TestSharedHashTable(unittest.TestCase):
+    def setUp(self):
+        self.ht = SharedHashTable(5)
+
+    def tearDown(self):
+        self.ht.close()
+
+    def test_retrieves_inserted_value(self):
+        pos = Position.start()
+        result = Result(ClosedInterval(-1, +1), Intensity(3, 1.1), Field.A4)
+
+        self.ht.update(pos, result)
+
+        self.assertEqual(self.ht.look_up(pos), result)
+
+    def test_retrieves_exact_value(self):
+        pos = Position.start()
+        result = Result(ClosedInterval(-64, -64), Intensity(60), Field.PS)
+
+        self.ht.update(pos, result)
+
+        self.assertEqual(self.ht.look_up(pos), result)
+
+    def test_retrieves_none_if_not_found(self):
+        self.assertEqual(self.ht.look_up(Position.start()), None)
+
+    def test_retrieves_none_if_not_found_after_clear(self):
+        pos = Position.start()
+        self.ht.update(pos, Result(ClosedInterval(-1, +1), Intensity(3), Field.A4))
+        self.ht.clear()
+
+        self.assertEqual(self.ht.look_up(pos), None)
+
+    def test_retrieves_none_if_entry_is_torn(self):
+        pos = Position.start()
+        self.ht.update(pos, Result(ClosedInterval(-1, +1), Intensity(3), Field.A4))
+        self.ht.entries[:, 2] ^= 1  # as if another process wrote the data only
+
+        self.assertEqual(self.ht.look_up(pos), None)
+
+    def test_pickled_table_shares_memory(self):
+        pos = Position.start()
+        result = Result(ClosedInterval(-1, +1), Intensity(3), Field.A4)
+        other = pickle.loads(pickle.dumps(self.ht))
+
+        other.update(pos, result)
+
+        self.assertEqual(self.ht.look_up(pos), result)
+        other.close()
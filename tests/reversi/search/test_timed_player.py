@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch
+from reversi import (
+    TimeManager,
+    TimedPlayer,
+    IterativeDeepening,
+    PrincipalVariation,
+    HashTable,
+    Position,
+    Field,
+    RandomPlayer,
+    played_games,
+    possible_moves,
+    play,
+    sorted_by_mobility_and_tt,
+)
+from constant_evaluator import ConstantEvaluator
+
+
+class TimeManagerTest(unittest.TestCase):
+    def test_spreads_time_over_remaining_moves(self):
+        manager = TimeManager(30.0)
+        self.assertAlmostEqual(manager.time_for(Position.start()), 1.0)
+        manager.spend(2.0)
+        pos = play(Position.start(), Field.D3)
+        self.assertAlmostEqual(manager.time_for(play(pos, Field.C3)), 28.0 / 29)
+
+    def test_new_game_resets_time(self):
+        manager = TimeManager(30.0)
+        manager.time_for(play(Position.start(), Field.D3))
+        manager.spend(10.0)
+        self.assertAlmostEqual(manager.time_for(Position.start()), 1.0)
+
+    def test_spend_stays_non_negative(self):
+        manager = TimeManager(1.0)
+        manager.time_for(Position.start())
+        manager.spend(2.0)
+        self.assertEqual(manager.remaining, 0.0)
+
+
+class TimedPlayerTest(unittest.TestCase):
+    def test_choose_move(self):
+        tt = HashTable(10_000)
+        search = PrincipalVariation(
+            sorted_by_mobility_and_tt(tt), tt, evaluator=ConstantEvaluator()
+        )
+        player = TimedPlayer(IterativeDeepening(search), total_time=1.0)
+        pos = Position.start()
+        self.assertIn(player.choose_move(pos), possible_moves(pos))
+        self.assertLess(player.time_manager.remaining, 1.0)
+
+    def test_clock_per_game_of_a_batch(self):
+        tt = HashTable(10_000)
+        search = PrincipalVariation(
+            sorted_by_mobility_and_tt(tt), tt, evaluator=ConstantEvaluator()
+        )
+        player = TimedPlayer(IterativeDeepening(search), total_time=0.5)
+        spent = {}
+        original_spend = TimeManager.spend
+
+        def spend(manager, seconds):
+            spent[id(manager)] = spent.get(id(manager), 0.0) + seconds
+            original_spend(manager, seconds)
+
+        with patch.object(TimeManager, "spend", spend):
+            played_games(player, RandomPlayer(), [Position.start()] * 4)
+
+        self.assertEqual(len(spent), 4)
+        for seconds in spent.values():
+            self.assertLess(seconds, 0.5 * 1.5)
+
+    def test_pass(self):
+        player = TimedPlayer(IterativeDeepening(), total_time=1.0)
+        self.assertEqual(player.choose_move(Position(0, 0)), Field.PS)
+
+    def test_ponder(self):
+        tt = HashTable(10_000)
+        search = PrincipalVariation(
+            sorted_by_mobility_and_tt(tt), tt, evaluator=ConstantEvaluator()
+        )
+        player = TimedPlayer(IterativeDeepening(search), total_time=1.0, ponder=True)
+        pos = Position.start()
+        move = player.choose_move(pos)
+        self.assertEqual(player.last_result.pv[0], move)
+        self.assertTrue(player.ponder_thread.is_alive())
+        player.stop_pondering()
+        self.assertIsNone(player.ponder_thread)